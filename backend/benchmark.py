@@ -0,0 +1,110 @@
+import logging
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from price_store import get_price_store, to_day
+
+BENCHMARK_SYMBOL = '^NSEI'
+
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkCache:
+    """Process-wide copy of the benchmark index closes.
+
+    Holds the last lookback_days of completed sessions in memory so return
+    comparisons are a slice instead of a download. The series is reloaded
+    once per calendar day: the first read on a new day triggers a background
+    refresh and keeps serving yesterday's series until it lands. Only a cold
+    start waits for the fetch. A reload that fails or comes back empty is
+    retried with exponential backoff (retry_base up to retry_max seconds)
+    rather than on every read or not until the next day.
+    """
+
+    def __init__(self, store, symbol=BENCHMARK_SYMBOL, lookback_days=400, retry_base=60, retry_max=3600):
+        self.store = store
+        self.symbol = symbol
+        self.lookback_days = lookback_days
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._lock = threading.Lock()
+        self._series = None
+        self._loaded_for = None
+        self._refreshing = False
+        self._failures = 0
+        self._retry_at = None
+
+    def refresh(self):
+        """Reload closes up to yesterday; today's session is still open."""
+        today = date.today()
+        try:
+            series = self.store.get_close(self.symbol, today - timedelta(days=self.lookback_days), today)
+        except Exception:
+            with self._lock:
+                self._refreshing = False
+                self._back_off()
+            raise
+        with self._lock:
+            self._refreshing = False
+            if len(series):
+                self._series = series
+                self._loaded_for = today
+                self._failures = 0
+                self._retry_at = None
+            else:
+                # Serve the empty series for now, but try again soon instead of tomorrow
+                if self._series is None:
+                    self._series = series
+                self._back_off()
+        return series
+
+    def _back_off(self):
+        """Schedule the next reload after a failed or empty one. Call with the lock held."""
+        self._failures += 1
+        delay = min(self.retry_base * 2 ** (self._failures - 1), self.retry_max)
+        self._retry_at = time.monotonic() + delay
+
+    def series(self):
+        with self._lock:
+            due = self._retry_at is None or time.monotonic() >= self._retry_at
+            series, stale = self._series, self._loaded_for != date.today() and due
+            start_background = series is not None and stale and not self._refreshing
+            if start_background:
+                self._refreshing = True
+        if series is None:
+            return self.refresh()
+        if start_background:
+            threading.Thread(target=self._refresh_quietly, daemon=True).start()
+        return series
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Benchmark refresh failed: {e}")
+
+    def window_return(self, start, end):
+        """Percent change of the benchmark over [start, end), or None if the window has no closes."""
+        series = self.series()
+        dates = series.index.to_numpy().astype('datetime64[D]')
+        lo, hi = np.searchsorted(dates, [to_day(start), to_day(end)])
+        if hi - lo < 1:
+            return None
+        closes = series.to_numpy()
+        return (closes[hi - 1] - closes[lo]) / closes[lo] * 100
+
+
+_default_benchmark = None
+_default_benchmark_lock = threading.Lock()
+
+
+def get_benchmark():
+    """Shared BenchmarkCache for the NIFTY 50 index."""
+    global _default_benchmark
+    with _default_benchmark_lock:
+        if _default_benchmark is None:
+            _default_benchmark = BenchmarkCache(get_price_store())
+        return _default_benchmark
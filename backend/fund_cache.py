@@ -0,0 +1,94 @@
+import json
+import re
+import threading
+import time
+
+SORT_FIELDS = ('return_per_annum', 'expense_ratio', 'return_1_month', 'return_3_month', 'return_6_month', 'current_value')
+
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+def to_number(value):
+    """Pull the first number out of display strings such as '₹45,585', '0.44%' or '35.45'."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER.search(str(value).replace(',', ''))
+    return float(match.group()) if match else None
+
+
+class FundUniverseCache:
+    """In-process copy of the serialized mutual fund universe.
+
+    The fund table changes only when it is reloaded, so the rows are read and
+    serialized once and every request is answered from memory. The snapshot
+    is rebuilt after invalidate() or once ttl seconds have passed, which
+    covers reloads done by another process.
+    """
+
+    def __init__(self, loader, ttl=3600):
+        self._loader = loader
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._loaded_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def _build(self):
+        funds = self._loader()
+        entries = []
+        for fund in funds:
+            entries.append({
+                'fund': fund,
+                'category_main': (fund['category']['main'] or '').lower(),
+                'category_sub': (fund['category']['sub'] or '').lower(),
+                'amc': (fund['amc'] or '').lower(),
+                'sort_keys': {field: to_number(fund.get(field)) for field in SORT_FIELDS},
+            })
+        return {'funds': funds, 'entries': entries, 'payload': json.dumps(funds), 'derived': {}}
+
+    def snapshot(self):
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._loaded_at > self._ttl:
+                self._snapshot = self._build()
+                self._loaded_at = time.monotonic()
+            return self._snapshot
+
+    def derived(self, key, builder):
+        """Memoize builder(funds) for the current snapshot, e.g. precomputed scoring arrays."""
+        snapshot = self.snapshot()
+        with self._lock:
+            if key not in snapshot['derived']:
+                snapshot['derived'][key] = builder(snapshot['funds'])
+            return snapshot['derived'][key]
+
+    def payload(self):
+        """The whole universe as a ready-to-send JSON string."""
+        return self.snapshot()['payload']
+
+    def query(self, category_main=None, category_sub=None, amc=None, sort_by=None, descending=True, page=1, page_size=50):
+        """Filter, sort and page the cached funds; returns (funds, total_matches)."""
+        if sort_by is not None and sort_by not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_FIELDS)}")
+
+        entries = self.snapshot()['entries']
+        if category_main:
+            entries = [e for e in entries if e['category_main'] == category_main.lower()]
+        if category_sub:
+            entries = [e for e in entries if e['category_sub'] == category_sub.lower()]
+        if amc:
+            entries = [e for e in entries if amc.lower() in e['amc']]
+
+        if sort_by:
+            # Funds without a parseable value always go last
+            present = [e for e in entries if e['sort_keys'][sort_by] is not None]
+            missing = [e for e in entries if e['sort_keys'][sort_by] is None]
+            present.sort(key=lambda e: e['sort_keys'][sort_by], reverse=descending)
+            entries = present + missing
+
+        start = (page - 1) * page_size
+        return [e['fund'] for e in entries[start:start + page_size]], len(entries)
@@ -0,0 +1,154 @@
+import io
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Database columns written by the loader, in COPY order (id is left to the sequence)
+FUND_COLUMNS = [
+    'name', 'category_main', 'category_sub', 'amc', 'aum_crores', 'current_value',
+    'return_per_annum', 'expense_ratio', 'return1month', 'return3month', 'return6month',
+    'age', 'age_years',
+]
+
+_UNIT_MULTIPLIERS = {'cr': 1e7, 'crs': 1e7, 'crore': 1e7, 'crores': 1e7, 'lakh': 1e5, 'lakhs': 1e5, 'l': 1e5}
+
+
+def parse_money(series, unit=1.0):
+    """Parse strings like '₹1,921 Crs', '11 Lakh' or '₹45585' into amounts expressed in unit rupees.
+
+    Values without a Crs/Lakh suffix are taken to be in unit already.
+    """
+    text_values = series.astype('string').str.replace(',', '', regex=False)
+    parts = text_values.str.extract(r'([-+]?\d+(?:\.\d+)?)\s*([A-Za-z]*)')
+    number = pd.to_numeric(parts[0], errors='coerce')
+    multiplier = parts[1].str.lower().map(_UNIT_MULTIPLIERS)
+    return np.where(multiplier.notna(), number * multiplier / unit, number)
+
+
+def parse_percent(series):
+    """Parse '+24.49% p.a.', '0.44%' or '35.45' into floats."""
+    extracted = series.astype('string').str.extract(r'([-+]?\d+(?:\.\d+)?)')[0]
+    return pd.to_numeric(extracted, errors='coerce')
+
+
+def parse_years(series):
+    """Parse fund ages such as '5+ yrs' or '9+yrs' into whole years."""
+    return pd.to_numeric(series.astype('string').str.extract(r'(\d+)')[0], errors='coerce').astype('Int64')
+
+
+def parse_category(series):
+    """Split scraped categories like "['DEBT', 'CREDIT RISK']" or "[['EQUITY'], ['SMALL', 'CAP']]".
+
+    Returns (main, sub) using the first two quoted tokens, matching the
+    category_main/category_sub convention of updateddata.csv.
+    """
+    tokens = series.astype('string').str.findall(r"'([^']*)'")
+    main = tokens.str[0]
+    sub = tokens.str[1]
+    return main, sub
+
+
+def normalize_frame(df):
+    """Map one source CSV (updateddata.csv or a scraper output) onto FUND_COLUMNS."""
+    out = pd.DataFrame({'name': df['Name'].astype('string').str.strip()})
+
+    if 'category_main' in df.columns:
+        out['category_main'] = df['category_main'].astype('string').str.strip()
+        out['category_sub'] = df['category_sub'].astype('string').str.strip()
+    else:
+        out['category_main'], out['category_sub'] = parse_category(df['Category'])
+
+    # The scraped size column is labelled AMC in some files and AUM in others
+    size = df['AMC'] if 'AMC' in df.columns else df['AUM']
+    out['amc'] = size.astype('string').str.strip()
+    out['aum_crores'] = parse_money(size, unit=1e7)
+    out['current_value'] = parse_money(df['Current value'])
+    out['return_per_annum'] = parse_percent(df['Return per annum'])
+    out['expense_ratio'] = parse_percent(df['Expense ratio'])
+    for months in (1, 3, 6):
+        column = f'return{months}month'
+        out[column] = parse_percent(df[column]) if column in df.columns else np.nan
+    out['age'] = df['Age'].astype('string').str.strip()
+    out['age_years'] = parse_years(df['Age'])
+
+    out = out[out['name'].notna() & (out['name'] != '')]
+    return out[FUND_COLUMNS]
+
+
+def read_fund_sources(paths):
+    """Read and merge source CSVs; earlier files win, later ones only fill gaps."""
+    frames = [normalize_frame(pd.read_csv(path)) for path in paths]
+    combined = pd.concat(frames, ignore_index=True)
+    return combined.groupby('name', sort=False, as_index=False).first()[FUND_COLUMNS]
+
+
+def _upsert_sql(source):
+    columns = ', '.join(FUND_COLUMNS)
+    updates = ', '.join(f"{c} = excluded.{c}" for c in FUND_COLUMNS if c != 'name')
+    changed = ' OR '.join(f"mutual_funds.{c} IS DISTINCT FROM excluded.{c}" for c in FUND_COLUMNS if c != 'name')
+    return f"""
+        INSERT INTO mutual_funds ({columns})
+        {source}
+        ON CONFLICT (name) DO UPDATE SET {updates}
+        WHERE {changed}
+    """
+
+
+def upsert_funds(connection, funds):
+    """Write the normalized fund frame, inserting new funds and updating only changed rows.
+
+    On PostgreSQL the frame is COPYed into a temporary staging table and
+    merged with one INSERT ... ON CONFLICT; elsewhere the same upsert runs
+    row by row. Returns the number of rows inserted or changed.
+    """
+    if funds.empty:
+        return 0
+
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text(
+            f"CREATE TEMP TABLE mutual_funds_staging ON COMMIT DROP AS "
+            f"SELECT {', '.join(FUND_COLUMNS)} FROM mutual_funds WITH NO DATA"
+        ))
+        buffer = io.StringIO()
+        funds.to_csv(buffer, index=False, header=False, na_rep='')
+        buffer.seek(0)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY mutual_funds_staging ({', '.join(FUND_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+        result = connection.execute(text(_upsert_sql(f"SELECT {', '.join(FUND_COLUMNS)} FROM mutual_funds_staging")))
+        return result.rowcount
+
+    rows = funds.astype(object).where(funds.notna(), None).to_dict(orient='records')
+    values = 'VALUES (' + ', '.join(f":{c}" for c in FUND_COLUMNS) + ')'
+    changed = 0
+    for row in rows:
+        changed += connection.execute(text(_upsert_sql(values)), row).rowcount
+    return changed
+
+
+# Keeps the first row per fund name, as read_fund_sources does. Tables loaded
+# before ux_mutual_funds_name existed can hold repeats (updateddata.csv has a
+# few), and the unique index cannot be built until they are gone.
+_DROP_DUPLICATE_FUNDS_SQL = text("""
+    DELETE FROM mutual_funds
+    WHERE name IS NOT NULL
+      AND id NOT IN (
+          SELECT MIN(id) FROM mutual_funds WHERE name IS NOT NULL GROUP BY name
+      )
+""")
+
+
+def drop_duplicate_funds(connection):
+    """Drop all but the first row per fund name; returns the number removed."""
+    return connection.execute(_DROP_DUPLICATE_FUNDS_SQL).rowcount
+
+
+def load_funds(connection, paths):
+    """Parse the given CSVs and upsert them into mutual_funds; returns a summary dict."""
+    funds = read_fund_sources(paths)
+    return {'funds': len(funds), 'changed': upsert_funds(connection, funds)}
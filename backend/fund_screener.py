@@ -0,0 +1,101 @@
+import numpy as np
+
+from fund_cache import to_number
+
+# Feature name -> key in the serialized fund dict. Positive weights favour
+# higher values, negative weights (expense ratio by default) favour lower ones.
+FEATURES = {
+    'return_per_annum': 'return_per_annum',
+    'return_1_month': 'return_1_month',
+    'return_3_month': 'return_3_month',
+    'return_6_month': 'return_6_month',
+    'expense_ratio': 'expense_ratio',
+    'age_years': 'age',
+}
+
+DEFAULT_WEIGHTS = {
+    'return_per_annum': 0.4,
+    'return_1_month': 0.05,
+    'return_3_month': 0.1,
+    'return_6_month': 0.15,
+    'expense_ratio': -0.2,
+    'age_years': 0.1,
+}
+
+GROUP_FIELDS = ('category_main', 'category_sub')
+
+
+class FundScreener:
+    """Scores the whole fund universe at once from arrays held in memory.
+
+    Each feature is standardised to a z-score when the screener is built, so
+    a request is one matrix-vector product plus a sort. Missing values score
+    as the universe average (z = 0).
+    """
+
+    def __init__(self, funds):
+        self.funds = funds
+        raw = np.array(
+            [[to_number(fund.get(key)) for key in FEATURES.values()] for fund in funds],
+            dtype=float,
+        ).reshape(len(funds), len(FEATURES))
+        mean = np.nanmean(raw, axis=0) if len(funds) else np.zeros(len(FEATURES))
+        std = np.nanstd(raw, axis=0) if len(funds) else np.ones(len(FEATURES))
+        std = np.where((std > 0) & np.isfinite(std), std, 1.0)
+        self.zscores = np.nan_to_num((raw - mean) / std)
+
+        self.groups = {}
+        for field in GROUP_FIELDS:
+            labels = np.array([(fund['category']['main'] if field == 'category_main' else fund['category']['sub']) or ''
+                               for fund in funds], dtype=object)
+            names, codes = np.unique(labels.astype(str), return_inverse=True)
+            self.groups[field] = (names, codes)
+
+    def weight_vector(self, weights=None):
+        if weights is not None and not isinstance(weights, dict):
+            raise ValueError("weights must be an object mapping feature names to numbers")
+        merged = dict(DEFAULT_WEIGHTS)
+        for name, value in (weights or {}).items():
+            if name not in FEATURES:
+                raise ValueError(f"Unknown weight '{name}', expected one of {', '.join(FEATURES)}")
+            try:
+                if isinstance(value, bool):
+                    raise TypeError
+                merged[name] = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Weight '{name}' must be a number") from None
+            if not np.isfinite(merged[name]):
+                raise ValueError(f"Weight '{name}' must be a finite number")
+        return merged, np.array([merged[name] for name in FEATURES])
+
+    def screen(self, weights=None, top_n=5, group_by='category_main', category_main=None):
+        """Return (weights_used, {group: [fund with score, ...]}) with the top_n funds per group.
+
+        category_main optionally restricts the universe before grouping.
+        """
+        if group_by not in GROUP_FIELDS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_FIELDS)}")
+        used, vector = self.weight_vector(weights)
+        scores = self.zscores @ vector
+        names, codes = self.groups[group_by]
+
+        mask = np.ones(len(scores), dtype=bool)
+        if category_main:
+            main_names, main_codes = self.groups['category_main']
+            matches = np.flatnonzero(np.char.lower(main_names.astype(str)) == category_main.lower())
+            mask = np.isin(main_codes, matches)
+
+        # Sort by group, then by descending score, and keep the first top_n of each group
+        candidates = np.flatnonzero(mask)
+        order = candidates[np.lexsort((-scores[candidates], codes[candidates]))]
+        sorted_codes = codes[order]
+        group_start = np.searchsorted(sorted_codes, sorted_codes, side='left')
+        rank = np.arange(len(order)) - group_start
+        selected = order[rank < top_n]
+
+        results = {}
+        for index in selected:
+            fund = dict(self.funds[index])
+            fund['score'] = round(float(scores[index]), 4)
+            results.setdefault(str(names[codes[index]]), []).append(fund)
+        return used, results
@@ -0,0 +1,109 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import bcrypt
+
+
+class HashingQueueFull(Exception):
+    """Raised when the hashing pool already has its maximum number of jobs queued."""
+
+
+class HashingTimeout(Exception):
+    """Raised when a queued hash does not finish within the configured timeout."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated thread pool with a bounded backlog.
+
+    bcrypt releases the GIL while hashing, so a small pool keeps request
+    threads free for cheap endpoints while a burst of logins queues here.
+    Submissions beyond max_pending fail immediately instead of piling up.
+    """
+
+    def __init__(self, rounds=12, workers=2, max_pending=32, timeout=10):
+        self.rounds = rounds
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {'completed': 0, 'rejected': 0, 'timeouts': 0, 'rehashed': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise HashingQueueFull("Password hashing queue is full")
+        with self._lock:
+            self._pending += 1
+        started = time.perf_counter()
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._finished(started, counted=False)
+            raise
+        # The slot stays taken until the job itself ends, even if the caller stops waiting
+        future.add_done_callback(lambda _: self._finished(started))
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise HashingTimeout(f"Password hashing took longer than {self.timeout}s")
+
+    def _finished(self, started, counted=True):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._pending -= 1
+            if counted:
+                self._stats['completed'] += 1
+                self._stats['total_seconds'] += elapsed
+                self._stats['max_seconds'] = max(self._stats['max_seconds'], elapsed)
+        self._slots.release()
+
+    def hash(self, password):
+        """Hash a password at the configured cost and return it as a str."""
+        hashed = self._run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds))
+        return hashed.decode('utf-8')
+
+    def verify(self, password, stored_hash):
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), stored_hash.encode('utf-8'))
+
+    def needs_rehash(self, stored_hash):
+        """True when stored_hash was made with a different cost than the configured one."""
+        try:
+            return int(stored_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def verify_and_update(self, password, stored_hash):
+        """Check a password; returns (valid, new_hash) where new_hash is set when the cost changed."""
+        if not self.verify(password, stored_hash):
+            return False, None
+        if not self.needs_rehash(stored_hash):
+            return True, None
+        try:
+            new_hash = self.hash(password)
+        except (HashingQueueFull, HashingTimeout):
+            # The login is still valid; rehash on a later, quieter attempt
+            return True, None
+        with self._lock:
+            self._stats['rehashed'] += 1
+        return True, new_hash
+
+    def metrics(self):
+        with self._lock:
+            completed = self._stats['completed']
+            return {
+                'rounds': self.rounds,
+                'queue_depth': self._pending,
+                'max_pending': self.max_pending,
+                'completed': completed,
+                'rejected': self._stats['rejected'],
+                'timeouts': self._stats['timeouts'],
+                'rehashed': self._stats['rehashed'],
+                'avg_latency_ms': round(self._stats['total_seconds'] / completed * 1000, 2) if completed else 0.0,
+                'max_latency_ms': round(self._stats['max_seconds'] * 1000, 2),
+            }
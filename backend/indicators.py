@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def sma(prices, window=10):
+    """Simple moving average from a running sum; the first window-1 values are NaN."""
+    prices = np.asarray(prices, dtype=float)
+    out = np.full(len(prices), np.nan)
+    if window <= len(prices):
+        sums = np.cumsum(np.insert(prices, 0, 0.0))
+        out[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return out
+
+
+def ema(prices, span=20):
+    return pd.Series(prices, dtype=float).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def rsi(prices, window=14):
+    """Wilder's relative strength index (0-100)."""
+    delta = np.diff(np.asarray(prices, dtype=float), prepend=np.nan)
+    gains = pd.Series(np.clip(delta, 0, None))
+    losses = pd.Series(np.clip(-delta, 0, None))
+    avg_gain = gains.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    avg_loss = losses.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100 - 100 / (1 + avg_gain.to_numpy() / avg_loss.to_numpy())
+    return np.where((avg_loss.to_numpy() == 0) & np.isfinite(avg_gain.to_numpy()), 100.0, values)
+
+
+def macd(prices, fast=12, slow=26, signal=9):
+    line = ema(prices, fast) - ema(prices, slow)
+    signal_line = pd.Series(line).ewm(span=signal, adjust=False).mean().to_numpy()
+    return {'macd': line, 'signal': signal_line, 'histogram': line - signal_line}
+
+
+def bollinger(prices, window=20, num_std=2.0):
+    rolling = pd.Series(prices, dtype=float).rolling(window)
+    middle = rolling.mean().to_numpy()
+    spread = rolling.std(ddof=0).to_numpy() * num_std
+    return {'middle': middle, 'upper': middle + spread, 'lower': middle - spread}
+
+
+def volatility(prices, window=20, annualize=True):
+    """Rolling standard deviation of daily log returns, annualised by default."""
+    returns = pd.Series(np.log(np.asarray(prices, dtype=float))).diff()
+    values = returns.rolling(window).std().to_numpy()
+    return values * np.sqrt(TRADING_DAYS) if annualize else values
+
+
+INDICATORS = {
+    'sma': (sma, {'window': 10}),
+    'ema': (ema, {'span': 20}),
+    'rsi': (rsi, {'window': 14}),
+    'macd': (macd, {'fast': 12, 'slow': 26, 'signal': 9}),
+    'bollinger': (bollinger, {'window': 20, 'num_std': 2.0}),
+    'volatility': (volatility, {'window': 20}),
+}
+
+
+def _to_list(values):
+    return [None if np.isnan(v) else round(float(v), 4) for v in values]
+
+
+def compute(prices, spec):
+    """Compute the requested indicators.
+
+    spec is a list of names (default parameters) or a dict of
+    name -> parameter overrides, e.g. {"sma": {"window": 50}, "rsi": {}}.
+    Returns name -> list (or name -> {part: list}) with None for warm-up values.
+    """
+    if isinstance(spec, (list, tuple)):
+        if not all(isinstance(name, str) for name in spec):
+            raise ValueError("indicators must be a list of names or an object of name -> parameters")
+        spec = {name: {} for name in spec}
+    if not isinstance(spec, dict):
+        raise ValueError("indicators must be a list of names or an object of name -> parameters")
+
+    results = {}
+    for name, overrides in spec.items():
+        if name not in INDICATORS:
+            raise ValueError(f"Unknown indicator '{name}', expected one of {', '.join(INDICATORS)}")
+        if overrides is not None and not isinstance(overrides, dict):
+            raise ValueError(f"Parameters for {name} must be an object of name -> value")
+        func, defaults = INDICATORS[name]
+        unknown = set(overrides or {}) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown parameter(s) for {name}: {', '.join(sorted(unknown))}")
+        params = {**defaults, **(overrides or {})}
+        for key, value in params.items():
+            # bool is an int subclass, so true/false would otherwise pass as 1/0
+            if isinstance(value, bool):
+                raise ValueError(f"{name}.{key} must be a number, not a boolean")
+            if key == 'num_std':
+                if not isinstance(value, (int, float)) or not value > 0:
+                    raise ValueError(f"{name}.{key} must be a positive number")
+                params[key] = float(value)
+            elif not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name}.{key} must be a positive integer")
+
+        values = func(prices, **params)
+        if isinstance(values, dict):
+            results[name] = {part: _to_list(series) for part, series in values.items()}
+        else:
+            results[name] = _to_list(values)
+    return results
@@ -0,0 +1,78 @@
+import os
+import threading
+import warnings
+from collections import OrderedDict
+
+import torch
+import torch.nn as nn
+
+from file_utils import atomic_write
+
+
+def export_model(model, path, example, quantize=False, tolerance=0.01):
+    """Save model as a TorchScript file for inference-only serving.
+
+    With quantize the GRU and Linear layers are converted to dynamic int8;
+    if that moves any prediction on example by more than tolerance (in
+    scaled price units) the float model is exported instead. Returns a
+    summary of what was written.
+    """
+    model.eval()
+    with torch.no_grad(), warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        reference = model(example)
+        chosen, quantized, drift = model, False, None
+        if quantize:
+            candidate = torch.ao.quantization.quantize_dynamic(model, {nn.GRU, nn.Linear}, dtype=torch.qint8)
+            drift = (candidate(example) - reference).abs().max().item()
+            if drift <= tolerance:
+                chosen, quantized = candidate, True
+        scripted = torch.jit.trace(chosen, example[:1])
+        with atomic_write(path) as handle:
+            torch.jit.save(scripted, handle)
+    return {
+        'format': 'torchscript',
+        'quantized': quantized,
+        'quantization_drift': None if drift is None else round(drift, 6),
+    }
+
+
+class PredictorCache:
+    """LRU of loaded TorchScript models so hot symbols skip deserialisation.
+
+    Entries are keyed by path and file mtime, so a re-exported model is
+    picked up on its next use.
+    """
+
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._models = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, path):
+        key = (path, os.path.getmtime(path))
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._models[key]
+            self._stats['misses'] += 1
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            module = torch.jit.load(path, map_location='cpu')
+        module.eval()
+
+        with self._lock:
+            for stale in [k for k in self._models if k[0] == path]:
+                del self._models[stale]
+            self._models[key] = module
+            while len(self._models) > self.capacity:
+                self._models.popitem(last=False)
+                self._stats['evictions'] += 1
+        return module
+
+    def metrics(self):
+        with self._lock:
+            return {'size': len(self._models), 'capacity': self.capacity, **self._stats}
@@ -0,0 +1,315 @@
+import io
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Rebuilds records.total for one user from a given record onward.
+# The running balance is a window SUM over the signed amounts ordered by
+# record_id, so every affected row is fixed in a single statement instead of
+# re-summing the history once per row.
+_RECOMPUTE_TOTALS_SQL = text("""
+    UPDATE records
+    SET total = running.balance
+    FROM (
+        SELECT record_id,
+               SUM(CASE
+                       WHEN transaction_type = 'Income' THEN amount
+                       WHEN transaction_type = 'Expense' THEN -amount
+                       ELSE 0
+                   END) OVER (ORDER BY record_id
+                              ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS balance
+        FROM records
+        WHERE serial_id = :serial_id
+    ) AS running
+    WHERE records.record_id = running.record_id
+      AND running.record_id >= :from_record_id
+      AND (records.total IS NULL OR records.total <> running.balance)
+""")
+
+
+def recompute_totals(session, serial_id, from_record_id=0):
+    """Recalculate the running balance of every record at or after from_record_id.
+
+    Runs inside the caller's transaction; pending ORM changes are flushed first
+    so the window sum sees inserts, edits and deletes made in the same request.
+    """
+    session.flush()
+    result = session.execute(_RECOMPUTE_TOTALS_SQL, {
+        'serial_id': serial_id,
+        'from_record_id': from_record_id,
+    })
+    return result.rowcount
+
+
+# Per-user rollups kept in step with records so balance and category lookups
+# are point reads. Deltas are applied with upserts so concurrent writers add
+# to the stored figures instead of overwriting each other.
+_BACKFILL_CATEGORY_TOTALS_SQL = text("""
+    INSERT INTO category_totals (serial_id, transaction_type, category, total)
+    SELECT serial_id, transaction_type, category, SUM(amount)
+    FROM records
+    WHERE serial_id = :serial_id
+    GROUP BY serial_id, transaction_type, category
+    ON CONFLICT (serial_id, transaction_type, category) DO NOTHING
+""")
+
+_BACKFILL_ACCOUNT_BALANCE_SQL = text("""
+    INSERT INTO account_balances (serial_id, income_total, expense_total)
+    SELECT :serial_id,
+           COALESCE(SUM(CASE WHEN transaction_type = 'Income' THEN amount ELSE 0 END), 0),
+           COALESCE(SUM(CASE WHEN transaction_type = 'Expense' THEN amount ELSE 0 END), 0)
+    FROM records
+    WHERE serial_id = :serial_id
+    ON CONFLICT (serial_id) DO NOTHING
+""")
+
+_UPSERT_ACCOUNT_BALANCE_SQL = text("""
+    INSERT INTO account_balances (serial_id, income_total, expense_total)
+    VALUES (:serial_id, :income, :expense)
+    ON CONFLICT (serial_id) DO UPDATE
+    SET income_total = account_balances.income_total + excluded.income_total,
+        expense_total = account_balances.expense_total + excluded.expense_total
+""")
+
+_UPSERT_CATEGORY_TOTAL_SQL = text("""
+    INSERT INTO category_totals (serial_id, transaction_type, category, total)
+    VALUES (:serial_id, :transaction_type, :category, :amount)
+    ON CONFLICT (serial_id, transaction_type, category) DO UPDATE
+    SET total = category_totals.total + excluded.total
+""")
+
+
+def ensure_rollups(session, serial_id):
+    """Build the rollup rows for a user from records the first time they are needed.
+
+    Call this before changing any of the user's records in the current
+    request, otherwise the backfill would count the pending change twice.
+    """
+    exists = session.execute(
+        text("SELECT 1 FROM account_balances WHERE serial_id = :serial_id"),
+        {'serial_id': serial_id},
+    ).first()
+    if exists:
+        return
+    session.execute(_BACKFILL_CATEGORY_TOTALS_SQL, {'serial_id': serial_id})
+    session.execute(_BACKFILL_ACCOUNT_BALANCE_SQL, {'serial_id': serial_id})
+
+
+def apply_rollup_delta(session, serial_id, transaction_type, category, amount):
+    """Add amount (negative to remove) to the user's balance and category rollups."""
+    if transaction_type not in ('Income', 'Expense'):
+        return
+    session.execute(_UPSERT_ACCOUNT_BALANCE_SQL, {
+        'serial_id': serial_id,
+        'income': amount if transaction_type == 'Income' else 0,
+        'expense': amount if transaction_type == 'Expense' else 0,
+    })
+    session.execute(_UPSERT_CATEGORY_TOTAL_SQL, {
+        'serial_id': serial_id,
+        'transaction_type': transaction_type,
+        'category': category,
+        'amount': amount,
+    })
+
+
+def get_balance(session, serial_id):
+    """Return (income_total, expense_total) for a user from the rollup table."""
+    row = session.execute(
+        text("SELECT income_total, expense_total FROM account_balances WHERE serial_id = :serial_id"),
+        {'serial_id': serial_id},
+    ).first()
+    if row is None:
+        return 0, 0
+    return row[0], row[1]
+
+
+def get_category_totals(session, serial_id, transaction_type):
+    """Return [(category, total)] for a user and transaction type from the rollup table."""
+    rows = session.execute(
+        text("""
+            SELECT category, total FROM category_totals
+            WHERE serial_id = :serial_id AND transaction_type = :transaction_type AND total <> 0
+            ORDER BY category
+        """),
+        {'serial_id': serial_id, 'transaction_type': transaction_type},
+    ).all()
+    return [(category, total) for category, total in rows]
+
+
+_COPY_RECORDS_SQL = (
+    "COPY records (serial_id, transaction_date, transaction_type, category, amount, total) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+_INSERT_RECORD_SQL = text("""
+    INSERT INTO records (serial_id, transaction_date, transaction_type, category, amount, total)
+    VALUES (:serial_id, :transaction_date, :transaction_type, :category, :amount, :total)
+""")
+
+# Budget spent is only ever changed by in-database increments, and remaining
+# is rewritten in the same statement, so concurrent writers cannot lose an
+# update or leave remaining out of step with spent.
+_ADD_BUDGET_SPENT_SQL = text("""
+    UPDATE budgets
+    SET spent = COALESCE(spent, 0) + :amount,
+        remaining = budget_limit - (COALESCE(spent, 0) + :amount)
+    WHERE serial_id = :serial_id AND category = :category
+""")
+
+_UPSERT_BUDGET_SQL = text("""
+    WITH expense AS (
+        SELECT COALESCE((
+            SELECT total FROM category_totals
+            WHERE serial_id = :serial_id AND transaction_type = 'Expense' AND category = :category
+        ), 0) AS total
+    )
+    INSERT INTO budgets (serial_id, category, budget_limit, spent, remaining)
+    VALUES (
+        :serial_id, :category, :budget_limit,
+        (SELECT total FROM expense), :budget_limit - (SELECT total FROM expense)
+    )
+    ON CONFLICT (serial_id, category) DO UPDATE
+    SET budget_limit = excluded.budget_limit,
+        spent = excluded.spent,
+        remaining = excluded.remaining
+    RETURNING budget_limit, spent, remaining
+""")
+
+
+# Keeps the oldest row per (serial_id, category). Older code could insert a
+# second budget for the same category, but its .first() lookups kept reading
+# and updating the lowest budget_id, so that row holds the real limit and
+# spent. The unique index that upsert_budget's ON CONFLICT relies on cannot be
+# built while such duplicates exist.
+_MERGE_DUPLICATE_BUDGETS_SQL = text("""
+    DELETE FROM budgets
+    WHERE budget_id NOT IN (
+        SELECT MIN(budget_id) FROM budgets GROUP BY serial_id, category
+    )
+""")
+
+
+def merge_duplicate_budgets(connection):
+    """Drop all but the oldest budget per user and category; returns the number removed."""
+    return connection.execute(_MERGE_DUPLICATE_BUDGETS_SQL).rowcount
+
+
+def add_budget_spent(session, serial_id, category, amount):
+    """Add amount (negative to remove) to the spent figure of the user's budget for category."""
+    session.execute(_ADD_BUDGET_SPENT_SQL, {
+        'serial_id': serial_id,
+        'category': category,
+        'amount': amount,
+    })
+
+
+def upsert_budget(session, serial_id, category, budget_limit):
+    """Create or update a budget in one statement, taking spent from the expense rollup.
+
+    Returns (budget_limit, spent, remaining) as stored.
+    """
+    ensure_rollups(session, serial_id)
+    row = session.execute(_UPSERT_BUDGET_SQL, {
+        'serial_id': serial_id,
+        'category': category,
+        'budget_limit': budget_limit,
+    }).first()
+    return row[0], row[1], row[2]
+
+
+def statement_to_records(frame, serial_id, category, opening_balance):
+    """Turn a Date/Debit/Credit/Balance statement frame into records rows.
+
+    Credits become Income and debits Expense, in statement order. Running
+    totals continue from opening_balance and are computed in integer paise
+    with a single cumulative sum.
+    """
+    dates = pd.to_datetime(frame['Date'], format='%d %b %Y', errors='coerce')
+    credit = pd.to_numeric(frame['Credit'], errors='coerce').fillna(0).to_numpy()
+    debit = pd.to_numeric(frame['Debit'], errors='coerce').fillna(0).to_numpy()
+    valid = dates.notna().to_numpy()
+
+    # One row per non-zero side of each statement line, credit first
+    position = np.arange(len(frame))
+    is_credit = valid & (credit > 0)
+    is_debit = valid & (debit > 0)
+    rows = pd.DataFrame({
+        'position': np.concatenate([position[is_credit], position[is_debit]]),
+        'side': np.concatenate([np.zeros(is_credit.sum(), dtype=np.int8), np.ones(is_debit.sum(), dtype=np.int8)]),
+        'transaction_date': np.concatenate([dates.to_numpy()[is_credit], dates.to_numpy()[is_debit]]),
+        'cents': np.concatenate([np.rint(credit[is_credit] * 100), np.rint(debit[is_debit] * 100)]).astype(np.int64),
+    }).sort_values(['position', 'side'], kind='stable')
+
+    signed = np.where(rows['side'].to_numpy() == 0, rows['cents'].to_numpy(), -rows['cents'].to_numpy())
+    opening_cents = int((Decimal(opening_balance) * 100).to_integral_value())
+
+    records = pd.DataFrame({
+        'serial_id': serial_id,
+        'transaction_date': rows['transaction_date'].dt.date.to_numpy(),
+        'transaction_type': np.where(rows['side'].to_numpy() == 0, 'Income', 'Expense'),
+        'category': category,
+        'amount': rows['cents'].to_numpy() / 100,
+        'total': (opening_cents + np.cumsum(signed)) / 100,
+    })
+    return records
+
+
+def bulk_import_statement(session, serial_id, frame, category):
+    """Insert a parsed bank statement into records for one user in a single batch.
+
+    Uses COPY on PostgreSQL and one executemany INSERT elsewhere. Rollups and
+    budget spent are updated once per (type, category) group rather than per
+    row. Returns the number of records written; the caller commits.
+    """
+    ensure_rollups(session, serial_id)
+    income_total, expense_total = get_balance(session, serial_id)
+    records = statement_to_records(frame, serial_id, category, income_total - expense_total)
+    if records.empty:
+        return 0
+
+    session.flush()
+    connection = session.connection()
+    if connection.dialect.name == 'postgresql':
+        buffer = io.StringIO()
+        records.to_csv(buffer, index=False, header=False, float_format='%.2f')
+        buffer.seek(0)
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(_COPY_RECORDS_SQL, buffer)
+        finally:
+            cursor.close()
+    else:
+        session.execute(_INSERT_RECORD_SQL, records.to_dict(orient='records'))
+
+    sums = records.groupby(['transaction_type', 'category'])['amount'].sum()
+    for (transaction_type, row_category), amount in sums.items():
+        amount = Decimal(f"{amount:.2f}")
+        apply_rollup_delta(session, serial_id, transaction_type, row_category, amount)
+        if transaction_type == 'Expense':
+            add_budget_spent(session, serial_id, row_category, amount)
+    return len(records)
+
+
+# A per-user counter bumped by every write; read endpoints derive their ETag
+# from it so an unchanged poll is answered from this one row.
+_BUMP_DATA_VERSION_SQL = text("""
+    INSERT INTO data_versions (serial_id, version)
+    VALUES (:serial_id, 1)
+    ON CONFLICT (serial_id) DO UPDATE
+    SET version = data_versions.version + 1
+""")
+
+
+def bump_data_version(session, serial_id):
+    """Mark the user's data as changed; call in the same transaction as the write."""
+    session.execute(_BUMP_DATA_VERSION_SQL, {'serial_id': serial_id})
+
+
+def get_data_version(session, serial_id):
+    version = session.execute(
+        text("SELECT version FROM data_versions WHERE serial_id = :serial_id"),
+        {'serial_id': serial_id},
+    ).scalar()
+    return version or 0
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+import numpy as np
+import torch
+from sklearn.preprocessing import MinMaxScaler
+
+from file_utils import atomic_write, file_lock
+
+SCALER_FIELDS = ('min_', 'scale_', 'data_min_', 'data_max_', 'data_range_')
+
+
+def scaler_to_dict(scaler):
+    return {field: getattr(scaler, field).tolist() for field in SCALER_FIELDS}
+
+
+def scaler_from_dict(params):
+    """Rebuild a fitted MinMaxScaler without refitting."""
+    scaler = MinMaxScaler()
+    for field in SCALER_FIELDS:
+        setattr(scaler, field, np.asarray(params[field], dtype=float))
+    scaler.n_features_in_ = len(params['min_'])
+    scaler.n_samples_seen_ = 0
+    return scaler
+
+
+class ModelRegistry:
+    """Trained GRU weights and their scalers on disk, keyed by symbol, dates and hyperparameters.
+
+    Each symbol has a folder with one .pt file per trained model and an
+    index.json listing what is there, so lookups never unpickle weights.
+    Index updates hold a lock file in the folder, so training workers in
+    separate processes can save into the same registry.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def key(symbol, start, end, params):
+        raw = json.dumps([symbol, str(start), str(end), params], sort_keys=True)
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def _folder(self, symbol):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_.-]', '_', symbol))
+
+    def _index(self, symbol):
+        path = os.path.join(self._folder(symbol), 'index.json')
+        if not os.path.exists(path):
+            return []
+        with open(path) as handle:
+            return json.load(handle)
+
+    def _load_entry(self, symbol, meta):
+        path = os.path.join(self._folder(symbol), f"{meta['key']}.pt")
+        if not os.path.exists(path):
+            return None
+        stored = torch.load(path, map_location='cpu', weights_only=True)
+        return {
+            'meta': meta,
+            'state_dict': stored['state_dict'],
+            'scaler': scaler_from_dict(meta['scaler']),
+        }
+
+    def find(self, symbol, start, end, params):
+        """Index entry for exactly this symbol, range and hyperparameters, without loading weights."""
+        key = self.key(symbol, start, end, params)
+        with self._lock:
+            return next((m for m in self._index(symbol) if m['key'] == key), None)
+
+    def get(self, symbol, start, end, params):
+        """The model trained on exactly this symbol, range and hyperparameters, or None."""
+        meta = self.find(symbol, start, end, params)
+        with self._lock:
+            return self._load_entry(symbol, meta) if meta else None
+
+    def artifact_path(self, symbol, key, suffix='.ts'):
+        """Where derived files for a registered model (e.g. its TorchScript export) live."""
+        folder = self._folder(symbol)
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"{key}{suffix}")
+
+    def latest_before(self, symbol, start, end, params):
+        """Newest model with the same start and hyperparameters whose range ends before end."""
+        with self._lock:
+            candidates = [m for m in self._index(symbol)
+                          if m['start'] == str(start) and m['params'] == params and m['end'] < str(end)]
+            if not candidates:
+                return None
+            return self._load_entry(symbol, max(candidates, key=lambda m: m['end']))
+
+    def save(self, symbol, start, end, params, state_dict, scaler, **extra):
+        key = self.key(symbol, start, end, params)
+        meta = {
+            'key': key,
+            'symbol': symbol,
+            'start': str(start),
+            'end': str(end),
+            'params': params,
+            'scaler': scaler_to_dict(scaler),
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            **extra,
+        }
+        folder = self._folder(symbol)
+        with self._lock:
+            os.makedirs(folder, exist_ok=True)
+            with atomic_write(os.path.join(folder, f"{key}.pt")) as handle:
+                torch.save({'state_dict': state_dict}, handle)
+
+            with file_lock(os.path.join(folder, 'index.lock')):
+                index = [m for m in self._index(symbol) if m['key'] != key] + [meta]
+                with atomic_write(os.path.join(folder, 'index.json'), 'w') as handle:
+                    json.dump(index, handle)
+        return meta
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """Process-wide ModelRegistry rooted at MODEL_REGISTRY_DIR (default backend/cache/models)."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            root = os.getenv('MODEL_REGISTRY_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'models'))
+            _default_registry = ModelRegistry(root)
+        return _default_registry
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+PERIOD_DAYS = {'1wk': 7, '1mo': 30, '3mo': 90, '6mo': 180, '1yr': 365}
+
+
+def parse_holdings(entries):
+    """Validate [{stockName, investmentAmount, period}, ...] into (symbol, amount, period) tuples."""
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("holdings must be a non-empty list")
+    holdings = []
+    for position, entry in enumerate(entries):
+        symbol = (entry or {}).get('stockName')
+        period = entry.get('period', '3mo') if entry else '3mo'
+        try:
+            amount = float(entry.get('investmentAmount', 0))
+        except (TypeError, ValueError):
+            amount = 0
+        if not symbol or amount <= 0:
+            raise ValueError(f"holding {position}: stockName and a positive investmentAmount are required")
+        if period not in PERIOD_DAYS:
+            raise ValueError(f"holding {position}: invalid period '{period}'")
+        holdings.append((symbol, amount, period))
+    return holdings
+
+
+def calculate_portfolio_returns(holdings, prices, benchmark, end_date=None):
+    """Returns for every holding plus portfolio totals, computed over arrays in one pass.
+
+    All symbols are loaded as one date x symbol frame covering the longest
+    period, so each holding's start and end close is a fancy-index lookup.
+    The benchmark is sliced once per distinct period.
+    """
+    end_date = end_date or datetime.now().date()
+    symbols = list(dict.fromkeys(symbol for symbol, _, _ in holdings))
+    widest = max(PERIOD_DAYS[period] for _, _, period in holdings)
+    closes = prices.get_close_many(symbols, end_date - timedelta(days=widest), end_date)
+
+    amounts = np.array([amount for _, amount, _ in holdings])
+    columns = np.array([symbols.index(symbol) for symbol, _, _ in holdings])
+    starts = np.array([np.datetime64(end_date - timedelta(days=PERIOD_DAYS[period]), 'D') for _, _, period in holdings])
+
+    if len(closes):
+        dates = closes.index.to_numpy().astype('datetime64[D]')
+        # First close on or after each start, last close in the window
+        first_close = closes.bfill().to_numpy()
+        last_close = closes.ffill().to_numpy()[-1]
+        rows = np.searchsorted(dates, starts)
+        in_range = rows < len(dates)
+        initial = np.where(in_range, first_close[np.minimum(rows, len(dates) - 1), columns], np.nan)
+        final = last_close[columns]
+    else:
+        initial = final = np.full(len(holdings), np.nan)
+
+    absolute = (final - initial) / initial * 100
+    stock_value = amounts * (1 + absolute / 100)
+
+    period_returns = {}
+    for period in {period for _, _, period in holdings}:
+        result = benchmark.window_return(end_date - timedelta(days=PERIOD_DAYS[period]), end_date)
+        period_returns[period] = np.nan if result is None else result
+    nifty = np.array([period_returns[period] for _, _, period in holdings])
+    nifty_value = amounts * (1 + np.nan_to_num(nifty) / 100)
+
+    priced = np.isfinite(absolute)
+    results = []
+    for i, (symbol, amount, period) in enumerate(holdings):
+        if not priced[i]:
+            results.append({'symbol': symbol, 'period': period, 'investment_amount': amount,
+                            'error': 'No data available for the given period'})
+            continue
+        results.append({
+            'symbol': symbol,
+            'period': period,
+            'investment_amount': amount,
+            'final_investment_value': round(float(stock_value[i]), 2),
+            'absolute_return': round(float(absolute[i]), 2),
+            'stock_value': round(float(stock_value[i]), 2),
+            'nifty_value': round(float(nifty_value[i]), 2),
+            'nifty_return': None if np.isnan(nifty[i]) else round(float(nifty[i]), 2),
+        })
+
+    invested = float(amounts[priced].sum())
+    value = float(stock_value[priced].sum())
+    benchmark_value = float(nifty_value[priced].sum())
+    portfolio = {
+        'holdings_priced': int(priced.sum()),
+        'holdings_failed': int((~priced).sum()),
+        'investment_amount': round(invested, 2),
+        'final_investment_value': round(value, 2),
+        'absolute_return': round((value - invested) / invested * 100, 2) if invested else 0,
+        'nifty_value': round(benchmark_value, 2),
+        'nifty_return': round((benchmark_value - invested) / invested * 100, 2) if invested else 0,
+    }
+    return {'holdings': results, 'portfolio': portfolio}
@@ -0,0 +1,251 @@
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from file_utils import atomic_write, file_lock
+
+PRICE_DTYPE = np.dtype([('date', 'datetime64[D]'), ('close', 'f8')])
+
+# Longest run of days a market can plausibly be closed (a weekend plus holidays).
+# An empty answer over a longer range is more likely a hidden download error.
+MAX_CLOSED_DAYS = int(os.getenv('PRICE_MAX_CLOSED_DAYS', 4))
+
+
+def to_day(value):
+    """Coerce a date, datetime, Timestamp or 'YYYY-MM-DD' string to numpy datetime64[D]."""
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[D]')
+    if isinstance(value, (datetime, pd.Timestamp)):
+        value = value.date()
+    return np.datetime64(value.isoformat() if isinstance(value, date) else str(value)[:10], 'D')
+
+
+class YFinanceSource:
+    """Daily closes from Yahoo Finance; the default upstream for PriceStore."""
+
+    def fetch(self, symbol, start, end):
+        """Return a Series of closes indexed by day for [start, end)."""
+        hist = yf.Ticker(symbol).history(start=str(start), end=str(end), timeout=10)
+        if hist.empty:
+            return pd.Series(dtype=float)
+        index = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+        return pd.Series(hist['Close'].to_numpy(), index=index.normalize())
+
+    def fetch_many(self, symbols, start, end):
+        """One threaded yf.download for several symbols; returns {symbol: Series}, omitting symbols with no rows."""
+        data = yf.download(list(symbols), start=str(start), end=str(end), auto_adjust=True,
+                           threads=True, progress=False, timeout=10)
+        if data.empty:
+            return {}
+        closes = data['Close']
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(symbols[0])
+        if closes.index.tz is not None:
+            closes.index = closes.index.tz_localize(None)
+        closes.index = closes.index.normalize()
+        return {symbol: closes[symbol].dropna() for symbol in symbols if symbol in closes}
+
+
+class PriceStore:
+    """Local daily-close cache, one memory-mapped .npy file per symbol.
+
+    Each symbol keeps a sorted (date, close) array plus a small JSON list of
+    the day ranges already fetched. A request only downloads the parts of
+    its range that are not covered yet, merges them in and is otherwise
+    served from disk. A range that comes back empty is recorded as covered
+    only when it looks like a market closure: no longer than MAX_CLOSED_DAYS,
+    or with stored closes on both sides. Other empty answers are treated as
+    failed fetches, since yfinance reports errors as empty frames. Today is
+    never recorded as covered because its close is still moving. Updates
+    hold a per-symbol lock file so several worker processes can share the
+    directory. The source is pluggable so tests can run offline.
+    """
+
+    def __init__(self, root, source=None):
+        self.root = root
+        self.source = source or YFinanceSource()
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _lock(self, symbol):
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _paths(self, symbol):
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+        return os.path.join(self.root, f"{safe}.npy"), os.path.join(self.root, f"{safe}.json")
+
+    def _lock_path(self, symbol):
+        return os.path.join(self.root, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)}.lock")
+
+    def _read(self, symbol):
+        data_path, ranges_path = self._paths(symbol)
+        if not os.path.exists(data_path):
+            return np.empty(0, dtype=PRICE_DTYPE), []
+        data = np.load(data_path, mmap_mode='r')
+        if not os.path.exists(ranges_path):
+            # First write still in progress; the ranges file follows the data
+            return data, []
+        with open(ranges_path) as handle:
+            ranges = [(np.datetime64(s, 'D'), np.datetime64(e, 'D')) for s, e in json.load(handle)]
+        return data, ranges
+
+    def _write(self, symbol, data, ranges):
+        data_path, ranges_path = self._paths(symbol)
+        with atomic_write(data_path) as handle:
+            np.save(handle, data)
+        with atomic_write(ranges_path, 'w') as handle:
+            json.dump([[str(s), str(e)] for s, e in ranges], handle)
+
+    @staticmethod
+    def missing_ranges(ranges, start, end):
+        """Parts of [start, end) not covered by the sorted, merged ranges."""
+        gaps, cursor = [], start
+        for s, e in ranges:
+            if e <= cursor:
+                continue
+            if s >= end:
+                break
+            if s > cursor:
+                gaps.append((cursor, min(s, end)))
+            cursor = max(cursor, e)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    @staticmethod
+    def merge_ranges(ranges):
+        merged = []
+        for s, e in sorted(ranges):
+            if merged and s <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+            else:
+                merged.append((s, e))
+        return merged
+
+    def _merge(self, symbol, frames, covered):
+        """Write fetched closes and covered ranges into the symbol's files; fetched values win on the same day."""
+        fetched = pd.concat(frames) if frames else pd.Series(dtype=float)
+        new = np.empty(len(fetched), dtype=PRICE_DTYPE)
+        new['date'] = fetched.index.to_numpy().astype('datetime64[D]')
+        new['close'] = fetched.to_numpy(dtype=float)
+        # Re-read under the file lock so a merge made by another process since our read is kept
+        with file_lock(self._lock_path(symbol)):
+            data, ranges = self._read(symbol)
+            combined = np.concatenate([new, np.asarray(data)])
+            _, first = np.unique(combined['date'], return_index=True)
+            self._write(symbol, combined[first], self.merge_ranges(ranges + covered))
+        return self._read(symbol)[0]
+
+    @staticmethod
+    def _closed_between(data, start, end):
+        """Whether an empty fetch of [start, end) can be trusted as the market being closed."""
+        if end - start <= np.timedelta64(MAX_CLOSED_DAYS, 'D'):
+            return True
+        dates = data['date']
+        return len(dates) > 0 and dates[0] < start and dates[-1] >= end
+
+    def _fill(self, symbol, start, end):
+        """Fetch whatever part of [start, end) is missing for symbol and merge it to disk."""
+        data, ranges = self._read(symbol)
+        gaps = self.missing_ranges(ranges, start, end)
+        if not gaps:
+            return data
+
+        today = np.datetime64(date.today(), 'D')
+        frames, covered = [], []
+        for s, e in gaps:
+            series = self.source.fetch(symbol, s, e)
+            if len(series):
+                frames.append(series)
+            if s < today and (len(series) or self._closed_between(data, s, min(e, today))):
+                covered.append((s, min(e, today)))
+        if not frames and not covered:
+            return data
+        return self._merge(symbol, frames, covered)
+
+    def get_close(self, symbol, start, end):
+        """Daily closes for [start, end) as a Series indexed by date, fetching only missing days."""
+        start, end = to_day(start), to_day(end)
+        with self._lock(symbol):
+            data = self._fill(symbol, start, end)
+        lo, hi = np.searchsorted(data['date'], [start, end])
+        window = data[lo:hi]
+        return pd.Series(np.array(window['close']), index=pd.DatetimeIndex(window['date']), name='Close')
+
+    def get_close_many(self, symbols, start, end):
+        """Closes for several symbols over [start, end) as a date x symbol DataFrame.
+
+        Symbols missing the same day range are downloaded together in one
+        batched request when the source supports fetch_many; distinct ranges
+        are fetched concurrently.
+        """
+        start, end = to_day(start), to_day(end)
+        symbols = list(dict.fromkeys(symbols))
+        today = np.datetime64(date.today(), 'D')
+
+        by_gap, stored = {}, {}
+        for symbol in symbols:
+            stored[symbol], ranges = self._read(symbol)
+            for gap in self.missing_ranges(ranges, start, end):
+                by_gap.setdefault(gap, []).append(symbol)
+
+        def fetch_group(item):
+            (s, e), group = item
+            if hasattr(self.source, 'fetch_many'):
+                return s, e, self.source.fetch_many(group, s, e)
+            return s, e, {symbol: self.source.fetch(symbol, s, e) for symbol in group}
+
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(by_gap)))) as pool:
+            batches = list(pool.map(fetch_group, by_gap.items()))
+        for s, e, batch in batches:
+            for symbol in by_gap[(s, e)]:
+                # Symbols absent from a batch had no rows in the range
+                series = batch.get(symbol)
+                rows = series is not None and len(series) > 0
+                entry = fetched.setdefault(symbol, ([], []))
+                if rows:
+                    entry[0].append(series)
+                if s < today and (rows or self._closed_between(stored[symbol], s, min(e, today))):
+                    entry[1].append((s, min(e, today)))
+
+        columns = {}
+        for symbol in symbols:
+            with self._lock(symbol):
+                data, _ = self._read(symbol)
+                frames, covered = fetched.get(symbol, ([], []))
+                if frames or covered:
+                    data = self._merge(symbol, frames, covered)
+            lo, hi = np.searchsorted(data['date'], [start, end])
+            window = data[lo:hi]
+            columns[symbol] = pd.Series(np.array(window['close']), index=pd.DatetimeIndex(window['date']))
+        return pd.DataFrame(columns, columns=symbols)
+
+    def history(self, symbol, start, end):
+        """Drop-in for Ticker.history(...)[['Close']]."""
+        return self.get_close(symbol, start, end).to_frame()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_price_store():
+    """Process-wide PriceStore rooted at PRICE_CACHE_DIR (default backend/cache/prices)."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            root = os.getenv('PRICE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'prices'))
+            _default_store = PriceStore(root)
+        return _default_store
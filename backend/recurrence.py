@@ -0,0 +1,38 @@
+import calendar
+from datetime import date, timedelta
+
+RECURRENCES = ('Daily', 'Weekly', 'Monthly')
+
+
+def occurrence_date(anchor, recurrence, index):
+    """Date of the index-th occurrence counted from anchor (index 0 is the anchor itself).
+
+    Monthly rules keep the anchor's day of month and clamp it to the month's
+    length, so a rule anchored on the 31st falls on Feb 28/29 and returns to
+    the 31st in March instead of drifting.
+    """
+    if recurrence == 'Daily':
+        return anchor + timedelta(days=index)
+    if recurrence == 'Weekly':
+        return anchor + timedelta(weeks=index)
+    if recurrence == 'Monthly':
+        month = anchor.month - 1 + index
+        year = anchor.year + month // 12
+        month = month % 12 + 1
+        return date(year, month, min(anchor.day, calendar.monthrange(year, month)[1]))
+    raise ValueError(f"Unknown recurrence '{recurrence}', expected one of {RECURRENCES}")
+
+
+def iter_occurrences(anchor, recurrence, first_index, until, last_index=None):
+    """Yield (index, date) for occurrences from first_index up to and including until.
+
+    last_index bounds rules with a fixed number of occurrences; None means
+    the rule repeats indefinitely.
+    """
+    index = first_index
+    while last_index is None or index <= last_index:
+        when = occurrence_date(anchor, recurrence, index)
+        if when > until:
+            return
+        yield index, when
+        index += 1
@@ -1,16 +1,22 @@
-import yfinance as yf
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
-from sklearn.model_selection import train_test_split
 import torch
 import torch.nn as nn
-import torch.optim as optim
 import requests
+import os
 import time
 from datetime import datetime, timedelta
 import warnings
 
+from price_store import get_price_store
+from benchmark import get_benchmark
+from model_registry import get_model_registry, scaler_from_dict
+from inference import export_model, PredictorCache
+from training import train_gru
+from ticker_info import get_ticker_info_cache
+
 # Suppress sklearn warnings
 warnings.filterwarnings('ignore', category=UserWarning)
 
@@ -27,27 +33,40 @@ class GRUModel(nn.Module):
         return self.fc(h)
 
 class StockPredictor:
-    def __init__(self):
+    def __init__(self, price_store=None, registry=None):
+        self.prices = price_store or get_price_store()
+        self.registry = registry or get_model_registry()
+        # Per-request training limits: seconds of wall clock and epochs without validation improvement
+        self.time_budget = float(os.getenv('TRAINING_TIME_BUDGET', 30))
+        self.patience = int(os.getenv('TRAINING_PATIENCE', 5))
+        # Trained models are exported to TorchScript, optionally as dynamic int8
+        self.quantize = os.getenv('MODEL_QUANTIZE', 'false').lower() == 'true'
+        self.quantize_tolerance = float(os.getenv('MODEL_QUANTIZE_TOLERANCE', 0.01))
+        self.predictors = PredictorCache(capacity=int(os.getenv('MODEL_LRU_SIZE', 8)))
+        self.ticker_info = get_ticker_info_cache()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
 
     def create_dataset(self, data, time_step=60):
-        """Create dataset for time series prediction"""
-        X, y = [], []
-        for i in range(time_step, len(data)):
-            X.append(data[i-time_step:i])
-            y.append(data[i, 0])
-        return np.array(X), np.array(y)
+        """Create dataset for time series prediction.
+
+        X[k] is data[k:k+time_step] and y[k] is data[k+time_step, 0], as float32
+        tensors. The windows are cut with a strided view and copied once into
+        a contiguous block, so no two windows share memory and an in-place op
+        on one cannot change its neighbours.
+        """
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        windows = np.ascontiguousarray(sliding_window_view(data[:-1], time_step, axis=0).transpose(0, 2, 1))
+        return torch.from_numpy(windows), torch.from_numpy(data[time_step:, 0].copy())
 
     def get_stock_data_with_retry(self, stock_name, start, end, max_retries=3):
         """Fetch stock data with retry mechanism and fallback"""
         for attempt in range(max_retries):
             try:
-                # Try with different timeout settings
-                stock = yf.Ticker(stock_name)
-                stock_data = stock.history(start=start, end=end, timeout=10)
+                # Served from the local price store; only missing days are downloaded
+                stock_data = self.prices.history(stock_name, start, end)
                 
                 if not stock_data.empty:
                     return stock_data[['Close']]
@@ -77,14 +96,15 @@ class StockPredictor:
         synthetic_data = pd.DataFrame({
             'Close': prices
         }, index=date_range)
+        # Marked so models trained on it are never stored in the registry
+        synthetic_data.attrs['synthetic'] = True
         
         return synthetic_data
 
     def get_stock_info_safe(self, stock_name):
         """Safely get stock info with fallback"""
         try:
-            stock = yf.Ticker(stock_name)
-            stock_info = stock.info
+            stock_info = self.ticker_info.get(stock_name)
             
             selected_info = {
                 "longName": stock_info.get("longName", stock_name),
@@ -108,10 +128,30 @@ class StockPredictor:
                 "priceToEarningsRatio": 20,
             }
 
-    def analyse(self, stock_name, start, end, epochs=30, batch_size=32):
+    def load_predictor(self, stock_name, meta, hidden_size):
+        """Exported TorchScript model from the LRU, or the float weights for entries saved before export."""
+        path = self.registry.artifact_path(stock_name, meta['key'])
+        if meta.get('export') and os.path.exists(path):
+            return self.predictors.get(path)
+        entry = self.registry.get(stock_name, meta['start'], meta['end'], meta['params'])
+        model = GRUModel(input_size=1, hidden_size=hidden_size, output_size=1)
+        model.load_state_dict(entry['state_dict'])
+        return model
+
+    def train_model(self, model, X_train_tensor, y_train_tensor, epochs, learning_rate=0.001, progress=None,
+                    batch_size=32, time_budget=None):
+        """Shuffled mini-batches with early stopping on a validation window; returns the loss curves."""
+        return train_gru(model, X_train_tensor, y_train_tensor, epochs=epochs, batch_size=batch_size,
+                         learning_rate=learning_rate, patience=self.patience,
+                         time_budget=self.time_budget if time_budget is None else time_budget,
+                         progress=progress)
+
+    def analyse(self, stock_name, start, end, epochs=30, batch_size=32, progress=None, time_budget=None):
         """
         Main analysis function with comprehensive error handling.
         Note: 'start' and 'end' should be in 'YYYY-MM-DD' format for yfinance.
+        progress, if given, receives (epoch, epochs, loss) while training.
+        time_budget caps training seconds (defaults to TRAINING_TIME_BUDGET).
         """
         try:
             print(f"Starting analysis for {stock_name}")
@@ -126,54 +166,80 @@ class StockPredictor:
             if len(stock_data) < 100:  # Need sufficient data for training
                 raise ValueError("Insufficient data for analysis")
             
-            # Preprocess data
-            scaler = MinMaxScaler()
-            scaled_data = scaler.fit_transform(stock_data)
+            # Reuse a registered model when one matches: the exact range needs
+            # inference only, an older range of the same series is fine-tuned
+            hidden_size, learning_rate = 50, 0.001
+            params = {
+                'hidden_size': hidden_size,
+                'time_step': min(30, len(stock_data)//4),
+                'epochs': epochs,
+                'batch_size': batch_size,
+                'learning_rate': learning_rate,
+            }
+            synthetic = stock_data.attrs.get('synthetic', False)
+            cached = None if synthetic else self.registry.find(stock_name, start, end, params)
+            warm = None if synthetic or cached else self.registry.latest_before(stock_name, start, end, params)
+
+            # Preprocess data; a reused model keeps the scaler it was trained with
+            values = stock_data[['Close']].to_numpy()
+            if cached:
+                scaler = scaler_from_dict(cached['scaler'])
+            else:
+                scaler = warm['scaler'] if warm else MinMaxScaler().fit(values)
+            scaled_data = scaler.transform(values)
 
             # Create dataset
-            X, y = self.create_dataset(scaled_data, time_step=min(30, len(scaled_data)//4))
+            X, y = self.create_dataset(scaled_data, time_step=params['time_step'])
             
             if len(X) < 20:  # Need minimum data for train/test split
                 raise ValueError("Not enough data points for training")
                 
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, shuffle=False
-            )
-
-            # Convert to PyTorch tensors
-            X_train_tensor = torch.tensor(X_train, dtype=torch.float32)
-            y_train_tensor = torch.tensor(y_train, dtype=torch.float32).view(-1, 1)
-            X_test_tensor = torch.tensor(X_test, dtype=torch.float32)
-            y_test_tensor = torch.tensor(y_test, dtype=torch.float32).view(-1, 1)
-
-            # Initialize and train model
-            model = GRUModel(input_size=1, hidden_size=50, output_size=1)
-            criterion = nn.MSELoss()
-            optimizer = optim.Adam(model.parameters(), lr=0.001)
-
-            print("Training model...")
-            model.train()
-            for epoch in range(epochs):
-                optimizer.zero_grad()
-                outputs = model(X_train_tensor)
-                loss = criterion(outputs, y_train_tensor)
-                loss.backward()
-                optimizer.step()
-
-                if (epoch + 1) % 10 == 0:
-                    print(f'Epoch [{epoch+1}/{epochs}], Loss: {loss.item():.4f}')
+            # Chronological 80/20 split by slicing, so the halves stay views
+            split = len(X) - int(np.ceil(len(X) * 0.2))
+            X_train, X_test = X[:split], X[split:]
+            y_train, y_test = y[:split], y[split:]
+
+            # Already tensors; the split slices share their memory
+            X_train_tensor = X_train
+            y_train_tensor = y_train.reshape(-1, 1)
+            X_test_tensor = X_test
+
+            if cached:
+                model_source = "cached"
+                training = cached.get('training')
+                predictor = self.load_predictor(stock_name, cached, hidden_size)
+            else:
+                model = GRUModel(input_size=1, hidden_size=hidden_size, output_size=1)
+                if warm:
+                    model.load_state_dict(warm['state_dict'])
+                model_source = "fine_tuned" if warm else "trained"
+                train_epochs = max(1, epochs // 5) if warm else epochs
+                print("Fine-tuning cached model..." if warm else "Training model...")
+                training = self.train_model(model, X_train_tensor, y_train_tensor, train_epochs, learning_rate,
+                                            progress, batch_size=batch_size, time_budget=time_budget)
+                predictor = model
+                if not synthetic:
+                    # Export for inference-only serving; later hits load this instead of the weights
+                    key = self.registry.key(stock_name, start, end, params)
+                    path = self.registry.artifact_path(stock_name, key)
+                    export = export_model(model, path, X_test_tensor, quantize=self.quantize,
+                                          tolerance=self.quantize_tolerance)
+                    self.registry.save(stock_name, start, end, params, model.state_dict(), scaler,
+                                       warm_start_from=warm['meta']['key'] if warm else None,
+                                       training=training, export=export)
+                    predictor = self.predictors.get(path)
 
             # Make predictions
-            model.eval()
+            predictor.eval()
             with torch.no_grad():
-                predicted_stock_price = model(X_test_tensor).numpy()
+                predicted_stock_price = predictor(X_test_tensor).numpy()
 
             # Inverse transform predictions
             predicted_stock_price_full = np.zeros((predicted_stock_price.shape[0], 1))
             predicted_stock_price_full[:, 0] = predicted_stock_price[:, 0]
 
             predicted_stock_price_final = scaler.inverse_transform(predicted_stock_price_full).flatten()
-            actual_stock_price = scaler.inverse_transform(y_test.reshape(-1, 1)).flatten()
+            actual_stock_price = scaler.inverse_transform(y_test.numpy().reshape(-1, 1)).flatten()
 
             print("Analysis completed successfully")
             
@@ -183,7 +249,9 @@ class StockPredictor:
                 "actual_stock_price": actual_stock_price.tolist(),
                 "predicted_stock_price": predicted_stock_price_final.tolist(),
                 "data_points": len(actual_stock_price),
-                "model_trained": True
+                "model_trained": True,
+                "model_source": model_source,
+                "training": training
             }
 
         except Exception as e:
@@ -222,18 +290,13 @@ def calculate_return_fixed(data):
         start_date = end_date - timedelta(days=duration_map[duration])
 
         # Try to fetch data with multiple attempts
+        prices = get_price_store()
         stock_data = None
-        nifty_data = None
         
         for attempt in range(3):
             try:
                 # Fetch stock data
-                stock = yf.Ticker(symbol)
-                stock_data = stock.history(start=start_date, end=end_date, timeout=10)
-                
-                # Fetch NIFTY data for comparison
-                nifty = yf.Ticker("^NSEI")
-                nifty_data = nifty.history(start=start_date, end=end_date, timeout=10)
+                stock_data = prices.history(symbol, start_date, end_date)
                 
                 if not stock_data.empty:
                     break
@@ -261,10 +324,13 @@ def calculate_return_fixed(data):
         nifty_return = 0
         nifty_value = investment_amount
         
-        if nifty_data is not None and not nifty_data.empty:
-            nifty_initial = nifty_data['Close'].iloc[0]
-            nifty_final = nifty_data['Close'].iloc[-1]
-            nifty_return = (nifty_final - nifty_initial) / nifty_initial * 100
+        try:
+            benchmark_return = get_benchmark().window_return(start_date, end_date)
+        except Exception as e:
+            print(f"Benchmark unavailable: {str(e)}")
+            benchmark_return = None
+        if benchmark_return is not None:
+            nifty_return = benchmark_return
             nifty_value = investment_amount * (1 + nifty_return / 100)
 
         result = {
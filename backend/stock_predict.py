@@ -1,11 +1,14 @@
 
 from flask import Flask, request, jsonify
-import yfinance as yf
 from datetime import datetime, timedelta
 from flask_cors import CORS
+from price_store import get_price_store
+from benchmark import get_benchmark
 
 app = Flask(__name__)
 CORS(app)
+price_store = get_price_store()
+benchmark = get_benchmark()
 
 @app.route('/calculate_return', methods=['POST'])
 def calculate_return():
@@ -30,8 +33,7 @@ def calculate_return():
         return jsonify({'error': 'Invalid duration'}), 400
 
     # Fetch historical data for the stock
-    stock = yf.Ticker(symbol)
-    hist = stock.history(start=start_date, end=end_date)
+    hist = price_store.history(symbol, start_date, end_date)
 
     # Calculate the return
     if hist.empty:
@@ -42,16 +44,12 @@ def calculate_return():
     absolute_return = (final_price - initial_price) / initial_price * 100
     final_investment_value = investment_amount * (1 + absolute_return / 100)
 
-    # Fetch nifty (e.g., NIFTY 50) data for comparison
-    nifty_symbol = "^NSEI"  # Example for NIFTY 50
-    nifty = yf.Ticker(nifty_symbol)
-    nifty_hist = nifty.history(start=start_date, end=end_date)
-    if nifty_hist.empty:
+    # NIFTY 50 comparison is sliced from the in-memory benchmark series
+    try:
+        nifty_return = benchmark.window_return(start_date, end_date)
+    except Exception as e:
+        print(f"Benchmark unavailable: {str(e)}")
         nifty_return = None
-    else:
-        nifty_initial_price = nifty_hist['Close'].iloc[0]
-        nifty_final_price = nifty_hist['Close'].iloc[-1]
-        nifty_return = (nifty_final_price - nifty_initial_price) / nifty_initial_price * 100
 
     # Prepare response
     result = {
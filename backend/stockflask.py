@@ -1,12 +1,20 @@
 from flask import Flask, request, jsonify
-from stock import StockPredictor  # Make sure to replace with the actual module name
 from flask_cors import CORS
+import os
+from training_jobs import available_cores, TrainingJobQueue, TrainingPoolBroken, TrainingQueueFull, TrainingTimeout
 
 app = Flask(__name__)
 CORS(app)
 
-# Initialize the stock analysis class
-stock_analyzer = StockPredictor()
+# All training, synchronous or queued, runs on one bounded pool of worker processes
+# that share the CPU cores between them, one worker per core unless configured
+training_jobs = TrainingJobQueue(
+    workers=int(os.getenv('TRAINING_WORKERS', len(available_cores()))),
+    max_pending=int(os.getenv('TRAINING_MAX_PENDING', 16)),
+    retention=int(os.getenv('TRAINING_JOB_RETENTION', 3600)),
+    pin_cpus=os.getenv('TRAINING_PIN_CPUS', 'false').lower() == 'true'
+)
+TRAINING_SYNC_TIMEOUT = float(os.getenv('TRAINING_SYNC_TIMEOUT', 300))
 
 @app.route('/analyse_stock', methods=['POST'])
 def analyse_stock():
@@ -23,13 +31,45 @@ def analyse_stock():
 
         # Dates are already in yyyy-MM-dd format from Flutter
 
-        # Call the analyse function
-        result = stock_analyzer.analyse(stock_name, start_date, end_date)
+        # Run the analysis on the training pool and wait for it
+        result = training_jobs.run(stock_name, start_date, end_date, timeout=TRAINING_SYNC_TIMEOUT)
         # Return the result as JSON
         return jsonify(result), 200
 
+    except (TrainingQueueFull, TrainingPoolBroken) as e:
+        return jsonify({'error': str(e)}), 503
+    except TrainingTimeout as e:
+        # The job keeps running; the client can poll it instead of retrying
+        return jsonify({'error': 'Analysis is taking longer than expected', 'job_id': str(e)}), 504
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/analyse_stock/jobs', methods=['POST'])
+def submit_analysis_job():
+    data = request.get_json(silent=True) or {}
+    stock_name = data.get('stock_name')
+    start_date = data.get('start_date')
+    end_date = data.get('end_date')
+
+    if not all([stock_name, start_date, end_date]):
+        return jsonify({'error': 'Missing required parameters'}), 400
+
+    try:
+        job_id = training_jobs.submit(stock_name, start_date, end_date)
+    except (TrainingQueueFull, TrainingPoolBroken) as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'job_id': job_id, 'state': 'queued'}), 202
+
+@app.route('/analyse_stock/jobs/<job_id>', methods=['GET'])
+def analysis_job_status(job_id):
+    status = training_jobs.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(status), 200
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return jsonify({'training': training_jobs.metrics()})
+
 #if __name__ == '__main__':
 #    app.run(debug=True,host='0.0.0.0',port=5002)
@@ -0,0 +1,148 @@
+import os
+import sqlite3
+import sys
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+import sqlalchemy as sa
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+# The ledger passes Decimal amounts; the stdlib sqlite3 driver needs to be told how to bind them
+sqlite3.register_adapter(Decimal, str)
+
+# SQLite stand-in for the ledger tables in app.py. app.py cannot be imported
+# without its external services, so the columns and indexes are mirrored
+# here; test_query_plans checks the index list against app.py's source.
+metadata = sa.MetaData()
+
+records = sa.Table(
+    'records', metadata,
+    sa.Column('record_id', sa.Integer, primary_key=True),
+    sa.Column('serial_id', sa.Integer, nullable=False),
+    sa.Column('transaction_date', sa.Date, nullable=False),
+    sa.Column('transaction_type', sa.String(10), nullable=False),
+    sa.Column('category', sa.String(50), nullable=False),
+    sa.Column('amount', sa.Numeric(15, 2), nullable=False),
+    sa.Column('total', sa.Numeric(15, 2)),
+    sa.Index('ix_records_serial_type_category', 'serial_id', 'transaction_type', 'category'),
+    sa.Index('ix_records_serial_record', 'serial_id', 'record_id'),
+    sa.Index('ix_records_serial_date', 'serial_id', 'transaction_date'),
+)
+
+sa.Table(
+    'account_balances', metadata,
+    sa.Column('serial_id', sa.Integer, primary_key=True),
+    sa.Column('income_total', sa.Numeric(15, 2), nullable=False, default=0),
+    sa.Column('expense_total', sa.Numeric(15, 2), nullable=False, default=0),
+)
+
+sa.Table(
+    'category_totals', metadata,
+    sa.Column('serial_id', sa.Integer, primary_key=True),
+    sa.Column('transaction_type', sa.String(10), primary_key=True),
+    sa.Column('category', sa.String(50), primary_key=True),
+    sa.Column('total', sa.Numeric(15, 2), nullable=False, default=0),
+)
+
+sa.Table(
+    'budgets', metadata,
+    sa.Column('budget_id', sa.Integer, primary_key=True),
+    sa.Column('serial_id', sa.Integer, nullable=False),
+    sa.Column('category', sa.String(50), nullable=False),
+    sa.Column('budget_limit', sa.Numeric(15, 2), nullable=False),
+    sa.Column('spent', sa.Numeric(15, 2), default=0),
+    sa.Column('remaining', sa.Numeric(15, 2)),
+    sa.Index('ux_budgets_serial_category', 'serial_id', 'category', unique=True),
+)
+
+sa.Table(
+    'data_versions', metadata,
+    sa.Column('serial_id', sa.Integer, primary_key=True),
+    sa.Column('version', sa.BigInteger, nullable=False, default=0),
+)
+
+sa.Table(
+    'vacation', metadata,
+    sa.Column('vacation_id', sa.Integer, primary_key=True),
+    sa.Column('serial_id', sa.Integer, nullable=False),
+    sa.Column('place', sa.String(100), nullable=False),
+    sa.Column('air_cost', sa.Numeric(15, 2), nullable=False),
+    sa.Column('days', sa.Integer, nullable=False),
+    sa.Column('budget_range', sa.String(50), nullable=False),
+    sa.Column('time_range', sa.String(50), nullable=False),
+    sa.Index('ix_vacation_serial', 'serial_id'),
+)
+
+sa.Table(
+    'reminder', metadata,
+    sa.Column('reminder_id', sa.Integer, primary_key=True),
+    sa.Column('serial_id', sa.Integer, nullable=False),
+    sa.Column('date', sa.DateTime, nullable=False),
+    sa.Column('description', sa.String(100), nullable=False),
+    sa.Column('mobile_number', sa.String(15), nullable=False),
+    sa.Index('ix_reminder_serial_date', 'serial_id', 'date'),
+)
+
+
+class FakeSource:
+    """Business-day closes for any range; answers listed in `script` are used first, in order.
+
+    A script entry is 'empty' (no rows, like yfinance hiding an error),
+    'error' (raises) or 'ok'.
+    """
+
+    def __init__(self, script=()):
+        self.script = list(script)
+        self.calls = []
+
+    def _answer(self, start, end):
+        outcome = self.script.pop(0) if self.script else 'ok'
+        if outcome == 'error':
+            raise ConnectionError("upstream down")
+        days = pd.bdate_range(str(start), str(np.datetime64(end) - 1))
+        if outcome == 'empty':
+            days = days[:0]
+        return pd.Series(np.arange(len(days), dtype=float) + 100, index=days)
+
+    def fetch(self, symbol, start, end):
+        self.calls.append((symbol, str(start), str(end)))
+        return self._answer(start, end)
+
+
+class FakeBatchSource(FakeSource):
+    def fetch_many(self, symbols, start, end):
+        self.calls.append((tuple(symbols), str(start), str(end)))
+        series = self._answer(start, end)
+        # Like yf.download, symbols without rows are left out
+        return {symbol: series for symbol in symbols} if len(series) else {}
+
+
+def create_ledger_engine(path):
+    """File-backed SQLite database with the ledger schema, safe to share between threads."""
+    engine = sa.create_engine(f"sqlite:///{path}", connect_args={'timeout': 30})
+
+    @sa.event.listens_for(engine, 'connect')
+    def _pragmas(dbapi_connection, connection_record):
+        dbapi_connection.execute('PRAGMA journal_mode=WAL')
+
+    metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_ledger_engine(tmp_path / 'ledger.db')
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def module_engine(tmp_path_factory):
+    """One database per test module, for suites that seed a large data set once."""
+    engine = create_ledger_engine(tmp_path_factory.mktemp('ledger') / 'ledger.db')
+    yield engine
+    engine.dispose()
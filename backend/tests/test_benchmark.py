@@ -0,0 +1,55 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from benchmark import BenchmarkCache
+from conftest import FakeSource
+from price_store import PriceStore
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def make_cache(tmp_path, script, **kwargs):
+    source = FakeSource(script)
+    return BenchmarkCache(PriceStore(str(tmp_path), source), lookback_days=60, **kwargs), source
+
+
+def test_window_return_slices_cached_series(tmp_path):
+    cache, source = make_cache(tmp_path, [])
+    end = date.today() - timedelta(days=1)
+    assert cache.window_return(end - timedelta(days=30), end) > 0
+    cache.window_return(end - timedelta(days=10), end)
+    assert len(source.calls) == 1
+
+
+def test_empty_cold_load_recovers(tmp_path):
+    cache, source = make_cache(tmp_path, ['empty'], retry_base=0)
+    assert cache.series().empty
+    assert cache.window_return(date.today() - timedelta(days=30), date.today()) is None
+
+    # The next read is past the (zero) backoff and reloads in the background
+    cache.series()
+    wait_for(lambda: cache._loaded_for == date.today())
+    assert len(cache.series()) > 0
+    assert len(source.calls) == 2
+
+
+def test_failed_cold_load_recovers(tmp_path):
+    cache, source = make_cache(tmp_path, ['error'], retry_base=0)
+    with pytest.raises(ConnectionError):
+        cache.series()
+    assert len(cache.series()) > 0
+    assert len(source.calls) == 2
+
+
+def test_empty_load_backs_off(tmp_path):
+    cache, source = make_cache(tmp_path, ['empty', 'empty'], retry_base=3600)
+    for _ in range(5):
+        cache.series()
+    assert len(source.calls) == 1
@@ -0,0 +1,107 @@
+import random
+import threading
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import ledger
+
+THREADS = 8
+WRITES_PER_THREAD = 150
+BUDGET_LIMIT = Decimal('50000.00')
+CATEGORIES = ['Food', 'Travel']
+
+
+def run_writers(engine, serial_id):
+    """Hammer one user's budget and rollups from several threads; returns the expected totals per category."""
+    expected = {category: Decimal('0') for category in CATEGORIES}
+    expected_lock = threading.Lock()
+    start = threading.Barrier(THREADS)
+    errors = []
+
+    def writer(seed):
+        rng = random.Random(seed)
+        try:
+            start.wait()
+            for _ in range(WRITES_PER_THREAD):
+                category = rng.choice(CATEGORIES)
+                # Mostly new expenses, some deletions reversing an earlier one
+                amount = Decimal(rng.randrange(1, 100000)) / 100
+                if rng.random() < 0.2:
+                    amount = -amount
+                with Session(engine) as session, session.begin():
+                    ledger.add_budget_spent(session, serial_id, category, amount)
+                    ledger.apply_rollup_delta(session, serial_id, 'Expense', category, amount)
+                with expected_lock:
+                    expected[category] += amount
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+    return expected
+
+
+def test_concurrent_budget_and_rollup_updates_keep_every_write(engine):
+    serial_id = 7
+    with Session(engine) as session, session.begin():
+        for category in CATEGORIES:
+            ledger.upsert_budget(session, serial_id, category, BUDGET_LIMIT)
+
+    expected = run_writers(engine, serial_id)
+
+    with Session(engine) as session:
+        budgets = {
+            category: (Decimal(str(spent)), Decimal(str(remaining)))
+            for category, spent, remaining in session.execute(
+                text("SELECT category, spent, remaining FROM budgets WHERE serial_id = :serial_id"),
+                {'serial_id': serial_id},
+            )
+        }
+        totals = {category: Decimal(str(total))
+                  for category, total in ledger.get_category_totals(session, serial_id, 'Expense')}
+        income, expense = ledger.get_balance(session, serial_id)
+
+    for category in CATEGORIES:
+        spent, remaining = budgets[category]
+        assert round(spent, 2) == expected[category]
+        assert round(remaining, 2) == BUDGET_LIMIT - expected[category]
+        assert round(totals[category], 2) == expected[category]
+    assert round(Decimal(str(expense)), 2) == sum(expected.values())
+    assert Decimal(str(income)) == 0
+
+
+def test_merging_duplicate_budgets_keeps_the_row_that_was_updated(engine):
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ux_budgets_serial_category"))
+        # The first row got every spend update through .first(); later duplicates never did
+        connection.execute(text("""
+            INSERT INTO budgets (serial_id, category, budget_limit, spent, remaining) VALUES
+                (3, 'Food', 8000, 2500, 5500),
+                (3, 'Food', 5000, 0, 5000),
+                (3, 'Food', 6000, 0, 6000),
+                (3, 'Rent', 20000, 15000, 5000),
+                (4, 'Food', 1000, 100, 900)
+        """))
+        assert ledger.merge_duplicate_budgets(connection) == 2
+        connection.execute(text("CREATE UNIQUE INDEX ux_budgets_serial_category ON budgets (serial_id, category)"))
+        rows = connection.execute(text(
+            "SELECT serial_id, category, budget_limit, spent, remaining FROM budgets ORDER BY budget_id"
+        )).all()
+    assert [(s, c, float(l), float(sp), float(r)) for s, c, l, sp, r in rows] == [
+        (3, 'Food', 8000, 2500, 5500),
+        (3, 'Rent', 20000, 15000, 5000),
+        (4, 'Food', 1000, 100, 900),
+    ]
+
+    with Session(engine) as session, session.begin():
+        ledger.add_budget_spent(session, 3, 'Food', Decimal('500'))
+        ledger.apply_rollup_delta(session, 3, 'Expense', 'Food', Decimal('3000'))
+        assert ledger.upsert_budget(session, 3, 'Food', Decimal('9000'))[1:] == (3000, 6000)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM budgets WHERE serial_id = 3")).scalar() == 2
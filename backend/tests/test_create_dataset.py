@@ -0,0 +1,77 @@
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+import torch
+
+from stock import StockPredictor
+
+TIME_STEP = 60
+# A bit over ten years of daily closes
+DAYS = 3700
+
+
+def create_dataset_loop(data, time_step=TIME_STEP):
+    """The list-of-copies loop create_dataset replaced, kept as the reference."""
+    X, y = [], []
+    for i in range(time_step, len(data)):
+        X.append(data[i - time_step:i])
+        y.append(data[i, 0])
+    return np.array(X), np.array(y)
+
+
+def create_dataset(data, time_step=TIME_STEP):
+    return StockPredictor.create_dataset(None, data, time_step=time_step)
+
+
+def measure(func, data, repeat=5):
+    """(median seconds, peak traced bytes) for building the dataset."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(data)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(timings)), peak
+
+
+@pytest.fixture(scope='module')
+def prices():
+    rng = np.random.default_rng(3)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, DAYS)))
+    return ((closes - closes.min()) / (closes.max() - closes.min())).reshape(-1, 1)
+
+
+def test_windows_match_reference_loop(prices):
+    X, y = create_dataset(prices)
+    X_ref, y_ref = create_dataset_loop(prices)
+
+    assert X.shape == (DAYS - TIME_STEP, TIME_STEP, 1)
+    assert X.dtype == y.dtype == torch.float32
+    np.testing.assert_allclose(X.numpy(), X_ref, rtol=1e-6)
+    np.testing.assert_allclose(y.numpy(), y_ref, rtol=1e-6)
+
+
+def test_windows_do_not_alias_each_other(prices):
+    X, y = create_dataset(prices)
+    before = X[1].clone()
+    X[0].mul_(2)
+
+    assert torch.equal(X[1], before)
+    assert X.is_contiguous()
+    assert not np.shares_memory(X.numpy(), prices)
+
+
+def test_views_beat_loop_on_ten_years(prices):
+    loop_seconds, loop_peak = measure(create_dataset_loop, prices)
+    view_seconds, view_peak = measure(create_dataset, prices)
+    print(f"{DAYS} days, time_step {TIME_STEP}: loop {loop_seconds * 1000:.2f} ms / {loop_peak / 1e6:.2f} MB peak, "
+          f"views {view_seconds * 1000:.2f} ms / {view_peak / 1e6:.3f} MB peak")
+
+    # One float32 copy of the windows against float64 lists plus the stacked array
+    assert view_peak < loop_peak / 2
+    assert view_seconds < loop_seconds
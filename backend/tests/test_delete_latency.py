@@ -0,0 +1,105 @@
+import os
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import ledger
+from conftest import create_ledger_engine
+
+RECORDS_PER_USER = 200
+SMALL_USERS = 50
+LARGE_USERS = 1000
+DELETES = 25
+
+# How much slower a delete may get when the ledger is 20x larger. A recompute
+# that scanned the whole table instead of one user's records would blow this.
+ALLOWED_SLOWDOWN = float(os.getenv('DELETE_LATENCY_SLOWDOWN', 3.0))
+
+
+def seed(engine, users):
+    rng = random.Random(users)
+    start = date(2023, 1, 1)
+    rows = [
+        (serial_id, (start + timedelta(days=i)).isoformat(), rng.choice(['Income', 'Expense']),
+         rng.choice(['Food', 'Rent', 'Travel']), round(rng.uniform(1, 5000), 2))
+        for i in range(RECORDS_PER_USER)
+        for serial_id in range(1, users + 1)
+    ]
+    with engine.begin() as connection:
+        connection.connection.driver_connection.executemany(
+            "INSERT INTO records (serial_id, transaction_date, transaction_type, category, amount) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        connection.exec_driver_sql('ANALYZE')
+    for serial_id in range(1, DELETES + 1):
+        with Session(engine) as session, session.begin():
+            ledger.ensure_rollups(session, serial_id)
+            ledger.recompute_totals(session, serial_id)
+
+
+def delete_record(session, record_id):
+    """The ledger work of DELETE /delete_transaction, without the Flask layer."""
+    serial_id, transaction_type, category, amount = session.execute(
+        text("SELECT serial_id, transaction_type, category, amount FROM records WHERE record_id = :record_id"),
+        {'record_id': record_id},
+    ).one()
+    ledger.ensure_rollups(session, serial_id)
+    ledger.apply_rollup_delta(session, serial_id, transaction_type, category, -amount)
+    ledger.add_budget_spent(session, serial_id, category, -amount)
+    session.execute(text("DELETE FROM records WHERE record_id = :record_id"), {'record_id': record_id})
+    ledger.recompute_totals(session, serial_id, record_id)
+    ledger.bump_data_version(session, serial_id)
+
+
+def median_delete_ms(engine):
+    """Delete a record a quarter of the way from the end of each of DELETES users' histories."""
+    timings = []
+    for serial_id in range(1, DELETES + 1):
+        with engine.connect() as connection:
+            record_id = connection.execute(
+                text("SELECT record_id FROM records WHERE serial_id = :serial_id ORDER BY record_id LIMIT 1 OFFSET :offset"),
+                {'serial_id': serial_id, 'offset': RECORDS_PER_USER * 3 // 4},
+            ).scalar()
+        started = time.perf_counter()
+        with Session(engine) as session, session.begin():
+            delete_record(session, record_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def assert_totals_consistent(engine, serial_id):
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT transaction_type, amount, total FROM records WHERE serial_id = :serial_id ORDER BY record_id"),
+            {'serial_id': serial_id},
+        ).all()
+        income, expense = connection.execute(
+            text("SELECT income_total, expense_total FROM account_balances WHERE serial_id = :serial_id"),
+            {'serial_id': serial_id},
+        ).one()
+    balance = 0.0
+    for transaction_type, amount, total in rows:
+        balance += float(amount) if transaction_type == 'Income' else -float(amount)
+        assert abs(float(total) - balance) < 0.01
+    assert abs(float(income) - float(expense) - balance) < 0.01
+
+
+def test_delete_latency_does_not_grow_with_ledger(tmp_path):
+    timings = {}
+    for users in (SMALL_USERS, LARGE_USERS):
+        engine = create_ledger_engine(tmp_path / f"ledger_{users}.db")
+        try:
+            seed(engine, users)
+            timings[users] = median_delete_ms(engine)
+            assert_totals_consistent(engine, 1)
+        finally:
+            engine.dispose()
+
+    small, large = timings[SMALL_USERS], timings[LARGE_USERS]
+    print(f"median delete: {small:.2f} ms at {SMALL_USERS * RECORDS_PER_USER} records, "
+          f"{large:.2f} ms at {LARGE_USERS * RECORDS_PER_USER} records")
+    assert large < small * ALLOWED_SLOWDOWN
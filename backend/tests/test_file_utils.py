@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from file_utils import atomic_write, file_lock
+
+INCREMENTS = 50
+
+
+def increment(counter_path, lock_path, times):
+    """Read-modify-write a counter file under file_lock, with no other coordination."""
+    for _ in range(times):
+        with file_lock(lock_path):
+            with open(counter_path) as handle:
+                value = int(handle.read())
+            with atomic_write(counter_path, 'w') as handle:
+                handle.write(str(value + 1))
+
+
+def rewrite(path, marker, times):
+    for _ in range(times):
+        with atomic_write(path, 'w') as handle:
+            handle.write(marker * 1000)
+
+
+def leftovers(directory):
+    return [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+
+def test_atomic_write_replaces_file(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text('old')
+    with atomic_write(str(path), 'w') as handle:
+        handle.write('new')
+        assert path.read_text() == 'old'
+    assert path.read_text() == 'new'
+    assert leftovers(tmp_path) == []
+
+
+def test_atomic_write_error_leaves_file_untouched(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text('old')
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path), 'w') as handle:
+            handle.write('partial')
+            raise RuntimeError('boom')
+    assert path.read_text() == 'old'
+    assert leftovers(tmp_path) == []
+
+
+def test_concurrent_writers_never_share_a_temp_file(tmp_path):
+    path = str(tmp_path / 'data.txt')
+    threads = [threading.Thread(target=rewrite, args=(path, marker, 20)) for marker in 'abcdefgh']
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    content = open(path).read()
+    assert len(content) == 1000 and len(set(content)) == 1
+    assert leftovers(tmp_path) == []
+
+
+@pytest.mark.parametrize('start_method', ['fork', 'spawn'])
+def test_file_lock_serialises_processes(tmp_path, start_method):
+    counter_path = str(tmp_path / 'counter')
+    lock_path = str(tmp_path / 'counter.lock')
+    with open(counter_path, 'w') as handle:
+        handle.write('0')
+
+    context = multiprocessing.get_context(start_method)
+    workers = [context.Process(target=increment, args=(counter_path, lock_path, INCREMENTS)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    # The parent takes the lock too, so threads and processes are mixed
+    increment(counter_path, lock_path, INCREMENTS)
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    assert int(open(counter_path).read()) == 5 * INCREMENTS
+    assert leftovers(tmp_path) == []
@@ -0,0 +1,40 @@
+import os
+
+import pandas as pd
+import pytest
+import sqlalchemy as sa
+
+from conftest import BACKEND
+from fund_loader import drop_duplicate_funds
+
+LEGACY_CSV = os.path.join(BACKEND, 'updateddata.csv')
+
+
+@pytest.fixture
+def legacy_funds(tmp_path):
+    """mutual_funds as it looked before ux_mutual_funds_name, loaded straight from updateddata.csv."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'funds.db'}")
+    names = pd.read_csv(LEGACY_CSV)['Name']
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE mutual_funds (id INTEGER PRIMARY KEY, name VARCHAR(100))")
+        connection.execute(sa.text("INSERT INTO mutual_funds (name) VALUES (:name)"),
+                           [{'name': name} for name in names] + [{'name': None}, {'name': None}])
+    yield engine, names
+    engine.dispose()
+
+
+def test_drop_duplicate_funds_allows_the_unique_index(legacy_funds):
+    engine, names = legacy_funds
+    assert names.duplicated().sum() > 0
+
+    with engine.begin() as connection:
+        removed = drop_duplicate_funds(connection)
+        connection.exec_driver_sql("CREATE UNIQUE INDEX ux_mutual_funds_name ON mutual_funds (name)")
+        kept = connection.exec_driver_sql("SELECT id, name FROM mutual_funds WHERE name IS NOT NULL ORDER BY id").all()
+        unnamed = connection.exec_driver_sql("SELECT COUNT(*) FROM mutual_funds WHERE name IS NULL").scalar()
+
+    assert removed == names.duplicated().sum()
+    assert [name for _, name in kept] == list(names.drop_duplicates())
+    # The first row per name survives, matching read_fund_sources
+    assert [fund_id for fund_id, _ in kept] == [i + 1 for i in names.drop_duplicates().index]
+    assert unnamed == 2
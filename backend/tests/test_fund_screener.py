@@ -0,0 +1,207 @@
+import json
+import math
+import os
+
+import pytest
+
+import fund_cache
+from fund_cache import FundUniverseCache, to_number
+from fund_loader import read_fund_sources
+from fund_screener import DEFAULT_WEIGHTS, FEATURES, FundScreener
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = [
+    os.path.join(BACKEND, 'updateddata.csv'),
+    os.path.join(BACKEND, '..', 'selenium', 'Lumpsum.csv'),
+    os.path.join(BACKEND, '..', 'selenium', 'Debt.csv'),
+]
+
+
+def fund_dict(row):
+    """The display format of MutualFund.to_dict, built from a loader row."""
+    def fmt(value, template):
+        return template.format(value) if value is not None and value == value else ''
+
+    def label(value):
+        return value if isinstance(value, str) else ''
+
+    return {
+        'name': row['name'],
+        'category': {'main': label(row['category_main']), 'sub': label(row['category_sub'])},
+        'amc': label(row['amc']),
+        'current_value': fmt(row['current_value'], '₹{:.0f}'),
+        'return_per_annum': fmt(row['return_per_annum'], '{:.2f}'),
+        'return_1_month': fmt(row['return1month'], '{:.2f}'),
+        'return_3_month': fmt(row['return3month'], '{:.2f}'),
+        'return_6_month': fmt(row['return6month'], '{:.2f}'),
+        'expense_ratio': fmt(row['expense_ratio'], '{:.2f}%'),
+        'age': label(row['age']),
+    }
+
+
+@pytest.fixture(scope='module')
+def funds():
+    frame = read_fund_sources(SOURCES)
+    return [fund_dict(row) for row in frame.to_dict(orient='records')]
+
+
+def reference_scores(funds, weights):
+    """Weighted z-scores computed one fund at a time, missing values scoring zero."""
+    columns = {}
+    for feature, key in FEATURES.items():
+        values = [to_number(fund.get(key)) for fund in funds]
+        present = [v for v in values if v is not None]
+        mean = sum(present) / len(present)
+        std = math.sqrt(sum((v - mean) ** 2 for v in present) / len(present)) or 1.0
+        columns[feature] = [0.0 if v is None else (v - mean) / std for v in values]
+    return [sum(weights[f] * columns[f][i] for f in FEATURES) for i in range(len(funds))]
+
+
+def test_screen_matches_reference_ranking(funds):
+    screener = FundScreener(funds)
+    used, results = screener.screen(top_n=3)
+    assert used == DEFAULT_WEIGHTS
+
+    scores = reference_scores(funds, DEFAULT_WEIGHTS)
+    expected = {}
+    for fund, score in sorted(zip(funds, scores), key=lambda pair: -pair[1]):
+        group = expected.setdefault(fund['category']['main'], [])
+        if len(group) < 3:
+            group.append((fund['name'], score))
+
+    assert set(results) == set(expected)
+    for group, ranked in results.items():
+        assert [fund['name'] for fund in ranked] == [name for name, _ in expected[group]]
+        for fund, (_, score) in zip(ranked, expected[group]):
+            assert fund['score'] == pytest.approx(score, abs=1e-3)
+
+
+def test_custom_weights_and_category_filter(funds):
+    screener = FundScreener(funds)
+    used, results = screener.screen(
+        weights={'expense_ratio': -1, 'return_per_annum': 0, 'return_1_month': '0', 'return_3_month': 0,
+                 'return_6_month': 0, 'age_years': 0},
+        top_n=2, group_by='category_sub', category_main='debt',
+    )
+    assert used['expense_ratio'] == -1.0
+    debt = [fund for fund in funds if fund['category']['main'] == 'DEBT']
+    assert sum(len(ranked) for ranked in results.values()) <= 2 * len(results)
+    for sub, ranked in results.items():
+        in_sub = [to_number(f['expense_ratio']) for f in debt if f['category']['sub'] == sub]
+        cheapest = min(v for v in in_sub if v is not None)
+        assert to_number(ranked[0]['expense_ratio']) == cheapest
+        assert ranked[0]['category']['main'] == 'DEBT'
+
+
+def test_screener_does_not_mutate_funds(funds):
+    _, results = FundScreener(funds).screen(top_n=1)
+    assert all('score' in ranked[0] for ranked in results.values())
+    assert all('score' not in fund for fund in funds)
+
+
+@pytest.mark.parametrize('weights', [
+    ['return_per_annum', 1],
+    'return_per_annum',
+    3,
+    {'return_per_annum': 'high'},
+    {'return_per_annum': None},
+    {'return_per_annum': True},
+    {'return_per_annum': [1]},
+    {'return_per_annum': 'nan'},
+    {'sharpe': 1},
+])
+def test_invalid_weights_are_rejected(funds, weights):
+    with pytest.raises(ValueError):
+        FundScreener(funds).screen(weights=weights)
+
+
+def test_unknown_group_is_rejected(funds):
+    with pytest.raises(ValueError):
+        FundScreener(funds).screen(group_by='amc')
+
+
+def test_empty_universe():
+    assert FundScreener([]).screen() == (DEFAULT_WEIGHTS, {})
+
+
+class CountingLoader:
+    def __init__(self, funds):
+        self.funds = funds
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return list(self.funds)
+
+
+def test_cache_loads_once_until_invalidated(funds):
+    loader = CountingLoader(funds)
+    cache = FundUniverseCache(loader)
+
+    assert cache.snapshot() is cache.snapshot()
+    assert json.loads(cache.payload()) == funds
+    assert loader.calls == 1
+
+    cache.invalidate()
+    cache.payload()
+    assert loader.calls == 2
+
+
+def test_cache_reloads_after_ttl(funds, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(fund_cache.time, 'monotonic', lambda: clock[0])
+    loader = CountingLoader(funds)
+    cache = FundUniverseCache(loader, ttl=60)
+
+    cache.snapshot()
+    clock[0] += 60
+    cache.snapshot()
+    assert loader.calls == 1
+    clock[0] += 1
+    cache.snapshot()
+    assert loader.calls == 2
+
+
+def test_derived_is_built_once_per_snapshot(funds):
+    cache = FundUniverseCache(CountingLoader(funds))
+    builds = []
+
+    def builder(universe):
+        builds.append(universe)
+        return FundScreener(universe)
+
+    screener = cache.derived('screener', builder)
+    assert cache.derived('screener', builder) is screener
+    assert len(builds) == 1 and builds[0] is cache.snapshot()['funds']
+
+    cache.invalidate()
+    assert cache.derived('screener', builder) is not screener
+    assert len(builds) == 2
+
+
+def test_query_filters_sorts_and_pages(funds):
+    cache = FundUniverseCache(CountingLoader(funds))
+
+    equity = [fund for fund in funds if fund['category']['main'] == 'EQUITY']
+    page, total = cache.query(category_main='equity', sort_by='return_per_annum', page_size=10)
+    assert total == len(equity)
+    values = [to_number(fund['return_per_annum']) for fund in page]
+    assert values == sorted(values, reverse=True)
+    assert values[0] == max(to_number(f['return_per_annum']) for f in equity
+                            if to_number(f['return_per_annum']) is not None)
+
+    second, _ = cache.query(category_main='EQUITY', sort_by='return_per_annum', page=2, page_size=10)
+    assert to_number(second[0]['return_per_annum']) <= values[-1]
+    assert not {f['name'] for f in page} & {f['name'] for f in second}
+
+    # Funds without a value sort last in either direction
+    everything, total = cache.query(sort_by='expense_ratio', descending=False, page_size=len(funds))
+    keys = [to_number(fund['expense_ratio']) for fund in everything]
+    present = [key for key in keys if key is not None]
+    assert keys[:len(present)] == sorted(present)
+    assert total == len(funds)
+
+
+def test_query_rejects_unknown_sort_field(funds):
+    with pytest.raises(ValueError):
+        FundUniverseCache(CountingLoader(funds)).query(sort_by='name')
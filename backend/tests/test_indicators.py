@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicators
+
+
+@pytest.fixture(scope='module')
+def prices():
+    rng = np.random.default_rng(11)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+
+
+def test_sma_matches_rolling_mean(prices):
+    expected = pd.Series(prices).rolling(10).mean().to_numpy()
+    np.testing.assert_allclose(indicators.sma(prices, 10), expected, equal_nan=True)
+    assert np.isnan(indicators.sma(prices[:5], 10)).all()
+
+
+def test_ema_matches_pandas(prices):
+    expected = pd.Series(prices).ewm(span=20, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(indicators.ema(prices, 20), expected)
+
+
+def test_rsi_matches_wilder_recursion(prices):
+    window = 14
+    delta = np.diff(prices)
+    gains, losses = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+    # Wilder's smoothing seeded with the first change, as ewm(adjust=False) does
+    def from_averages(gain, loss):
+        return 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+    avg_gain, avg_loss = gains[0], losses[0]
+    expected = [np.nan, from_averages(avg_gain, avg_loss)]
+    for gain, loss in zip(gains[1:], losses[1:]):
+        avg_gain = (avg_gain * (window - 1) + gain) / window
+        avg_loss = (avg_loss * (window - 1) + loss) / window
+        expected.append(from_averages(avg_gain, avg_loss))
+
+    values = indicators.rsi(prices, window)
+    assert np.isnan(values[:window]).all()
+    np.testing.assert_allclose(values[window:], expected[window:])
+    assert ((values[window:] >= 0) & (values[window:] <= 100)).all()
+
+
+def test_rsi_is_100_without_losses():
+    assert indicators.rsi(np.arange(1.0, 40.0), 14)[-1] == 100.0
+
+
+def test_macd_histogram_is_line_minus_signal(prices):
+    result = indicators.macd(prices)
+    expected_line = indicators.ema(prices, 12) - indicators.ema(prices, 26)
+    np.testing.assert_allclose(result['macd'], expected_line)
+    np.testing.assert_allclose(result['histogram'], result['macd'] - result['signal'])
+
+
+def test_bollinger_bands_are_symmetric(prices):
+    bands = indicators.bollinger(prices, 20, 2.0)
+    np.testing.assert_allclose(bands['upper'] - bands['middle'], bands['middle'] - bands['lower'])
+    expected_spread = pd.Series(prices).rolling(20).std(ddof=0).to_numpy() * 2.0
+    np.testing.assert_allclose(bands['upper'] - bands['middle'], expected_spread, equal_nan=True)
+
+
+def test_volatility_is_annualised_log_return_std(prices):
+    daily = indicators.volatility(prices, 20, annualize=False)
+    expected = pd.Series(np.log(prices)).diff().rolling(20).std().to_numpy()
+    np.testing.assert_allclose(daily, expected, equal_nan=True)
+    np.testing.assert_allclose(indicators.volatility(prices, 20), daily * np.sqrt(252), equal_nan=True)
+
+
+def test_compute_applies_overrides_and_nulls_warm_up(prices):
+    result = indicators.compute(prices, {'sma': {'window': 50}, 'bollinger': {'num_std': 1}, 'rsi': None})
+    assert set(result) == {'sma', 'bollinger', 'rsi'}
+    assert result['sma'][:49] == [None] * 49
+    assert result['sma'][49] == round(float(prices[:50].mean()), 4)
+    assert set(result['bollinger']) == {'middle', 'upper', 'lower'}
+    assert len(result['rsi']) == len(prices)
+
+
+def test_compute_accepts_a_list_of_names(prices):
+    assert set(indicators.compute(prices, ['ema', 'macd'])) == {'ema', 'macd'}
+
+
+@pytest.mark.parametrize('spec', [
+    'sma',
+    5,
+    [{'sma': {}}],
+    {'unknown': {}},
+    {'sma': 5},
+    {'sma': [10]},
+    {'sma': {'span': 10}},
+    {'sma': {'window': 0}},
+    {'sma': {'window': -3}},
+    {'sma': {'window': 2.5}},
+    {'sma': {'window': '10'}},
+    {'sma': {'window': True}},
+    {'bollinger': {'num_std': None}},
+    {'bollinger': {'num_std': 'wide'}},
+    {'bollinger': {'num_std': False}},
+    {'bollinger': {'num_std': 0}},
+])
+def test_compute_rejects_bad_specs_with_value_error(prices, spec):
+    with pytest.raises(ValueError):
+        indicators.compute(prices, spec)
@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+
+import numpy as np
+import torch
+from sklearn.preprocessing import MinMaxScaler
+
+from model_registry import ModelRegistry
+
+PARAMS = {'time_step': 60, 'hidden_size': 50, 'epochs': 20}
+
+
+def fitted_scaler(low=100.0, high=250.0):
+    return MinMaxScaler().fit(np.array([[low], [high], [(low + high) / 2]]))
+
+
+def state(value):
+    return {'weight': torch.full((3, 2), float(value)), 'bias': torch.zeros(3)}
+
+
+def save_models(root, symbol, first, count):
+    """Save count models under different hyperparameters, as a training worker would."""
+    registry = ModelRegistry(root)
+    for epochs in range(first, first + count):
+        registry.save(symbol, '2023-01-01', '2024-01-01', {**PARAMS, 'epochs': epochs}, state(epochs), fitted_scaler())
+
+
+def test_save_then_get_round_trips(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    scaler = fitted_scaler()
+    meta = registry.save('TCS.NS', '2023-01-01', '2024-01-01', PARAMS, state(1), scaler, rmse=1.5)
+
+    assert registry.find('TCS.NS', '2023-01-01', '2024-01-01', PARAMS) == meta
+    assert meta['rmse'] == 1.5
+    entry = registry.get('TCS.NS', '2023-01-01', '2024-01-01', PARAMS)
+    assert torch.equal(entry['state_dict']['weight'], state(1)['weight'])
+    values = np.array([[120.0], [240.0]])
+    np.testing.assert_allclose(entry['scaler'].transform(values), scaler.transform(values))
+    np.testing.assert_allclose(entry['scaler'].inverse_transform([[0.5]]), scaler.inverse_transform([[0.5]]))
+
+
+def test_lookups_are_exact(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.save('TCS.NS', '2023-01-01', '2024-01-01', PARAMS, state(1), fitted_scaler())
+
+    assert registry.get('TCS.NS', '2023-01-01', '2024-02-01', PARAMS) is None
+    assert registry.get('TCS.NS', '2023-01-01', '2024-01-01', {**PARAMS, 'epochs': 21}) is None
+    assert registry.get('INFY.NS', '2023-01-01', '2024-01-01', PARAMS) is None
+
+
+def test_resaving_replaces_the_entry(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.save('TCS.NS', '2023-01-01', '2024-01-01', PARAMS, state(1), fitted_scaler())
+    registry.save('TCS.NS', '2023-01-01', '2024-01-01', PARAMS, state(2), fitted_scaler())
+
+    assert len(registry._index('TCS.NS')) == 1
+    entry = registry.get('TCS.NS', '2023-01-01', '2024-01-01', PARAMS)
+    assert entry['state_dict']['weight'][0, 0].item() == 2.0
+
+
+def test_latest_before_picks_newest_earlier_range(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    for end, value in (('2023-06-01', 1), ('2023-09-01', 2), ('2024-03-01', 3)):
+        registry.save('TCS.NS', '2023-01-01', end, PARAMS, state(value), fitted_scaler())
+    registry.save('TCS.NS', '2022-01-01', '2023-12-01', PARAMS, state(4), fitted_scaler())
+    registry.save('TCS.NS', '2023-01-01', '2023-12-01', {**PARAMS, 'epochs': 5}, state(5), fitted_scaler())
+
+    entry = registry.latest_before('TCS.NS', '2023-01-01', '2024-01-01', PARAMS)
+    assert entry['meta']['end'] == '2023-09-01'
+    assert registry.latest_before('TCS.NS', '2023-01-01', '2023-06-01', PARAMS) is None
+
+
+def test_missing_weights_file_is_a_miss(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    meta = registry.save('TCS.NS', '2023-01-01', '2024-01-01', PARAMS, state(1), fitted_scaler())
+    os.remove(os.path.join(registry._folder('TCS.NS'), f"{meta['key']}.pt"))
+    assert registry.get('TCS.NS', '2023-01-01', '2024-01-01', PARAMS) is None
+
+
+def test_symbols_are_sanitised_into_folders(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.save('^NSE/EI', '2023-01-01', '2024-01-01', PARAMS, state(1), fitted_scaler())
+    path = registry.artifact_path('^NSE/EI', 'abc')
+    assert os.path.dirname(path) == os.path.join(str(tmp_path), '_NSE_EI')
+    assert path.endswith('abc.ts')
+
+
+def test_concurrent_processes_do_not_lose_index_entries(tmp_path):
+    # Forked rather than spawned so the workers do not each spend seconds importing torch
+    root = str(tmp_path)
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=save_models, args=(root, 'TCS.NS', first, 15)) for first in range(0, 60, 15)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(120)
+        assert worker.exitcode == 0
+
+    registry = ModelRegistry(root)
+    assert sorted(meta['params']['epochs'] for meta in registry._index('TCS.NS')) == list(range(60))
+    for epochs in range(60):
+        entry = registry.get('TCS.NS', '2023-01-01', '2024-01-01', {**PARAMS, 'epochs': epochs})
+        assert entry['state_dict']['weight'][0, 0].item() == float(epochs)
+    assert not [name for name in os.listdir(registry._folder('TCS.NS')) if name.endswith('.tmp')]
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import FakeBatchSource, FakeSource
+from price_store import PriceStore
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / 'prices')
+
+
+def test_second_read_is_served_from_disk(root):
+    source = FakeSource()
+    store = PriceStore(root, source)
+    first = store.get_close('INFY.NS', '2024-01-01', '2024-03-01')
+    second = store.get_close('INFY.NS', '2024-01-15', '2024-02-01')
+
+    assert len(source.calls) == 1
+    assert len(first) == len(pd.bdate_range('2024-01-01', '2024-02-29'))
+    assert second.index.min() == pd.Timestamp('2024-01-15')
+    assert second.index.max() == pd.Timestamp('2024-01-31')
+
+
+def test_only_missing_days_are_fetched(root):
+    source = FakeSource()
+    store = PriceStore(root, source)
+    store.get_close('INFY.NS', '2024-01-01', '2024-02-01')
+    store.get_close('INFY.NS', '2024-01-15', '2024-03-01')
+
+    assert source.calls[1] == ('INFY.NS', '2024-02-01', '2024-03-01')
+
+
+def test_empty_weekend_is_cached(root):
+    source = FakeSource(['empty'])
+    store = PriceStore(root, source)
+    for _ in range(3):
+        assert store.get_close('INFY.NS', '2024-01-06', '2024-01-08').empty
+
+    assert len(source.calls) == 1
+
+
+def test_empty_long_range_is_retried(root):
+    # A hidden download error must not become a permanent hole
+    source = FakeSource(['empty'])
+    store = PriceStore(root, source)
+    assert store.get_close('INFY.NS', '2024-01-01', '2024-03-01').empty
+
+    recovered = store.get_close('INFY.NS', '2024-01-01', '2024-03-01')
+    assert len(source.calls) == 2
+    assert len(recovered) == len(pd.bdate_range('2024-01-01', '2024-02-29'))
+
+
+def test_empty_long_range_between_stored_closes_is_cached(root):
+    source = FakeSource()
+    store = PriceStore(root, source)
+    store.get_close('INFY.NS', '2024-01-01', '2024-01-10')
+    store.get_close('INFY.NS', '2024-01-20', '2024-01-31')
+
+    source.script = ['empty']
+    store.get_close('INFY.NS', '2024-01-01', '2024-01-31')
+    store.get_close('INFY.NS', '2024-01-01', '2024-01-31')
+
+    assert source.calls[2:] == [('INFY.NS', '2024-01-10', '2024-01-20')]
+
+
+def test_failed_fetch_leaves_gap_open(root):
+    source = FakeSource(['error'])
+    store = PriceStore(root, source)
+    with pytest.raises(ConnectionError):
+        store.get_close('INFY.NS', '2024-01-06', '2024-01-08')
+
+    store.get_close('INFY.NS', '2024-01-06', '2024-01-08')
+    assert len(source.calls) == 2
+
+
+def test_today_is_never_covered(root):
+    source = FakeSource()
+    store = PriceStore(root, source)
+    today = np.datetime64('today', 'D')
+    store.get_close('INFY.NS', today - 10, today + 1)
+    store.get_close('INFY.NS', today - 10, today + 1)
+
+    assert source.calls[1] == ('INFY.NS', str(today), str(today + 1))
+
+
+def test_get_close_many_batches_and_retries_missing_symbols(root):
+    source = FakeBatchSource(['empty'])
+    store = PriceStore(root, source)
+    frame = store.get_close_many(['INFY.NS', 'TCS.NS'], '2024-01-01', '2024-03-01')
+    assert frame.empty
+    assert list(frame.columns) == ['INFY.NS', 'TCS.NS']
+
+    frame = store.get_close_many(['INFY.NS', 'TCS.NS'], '2024-01-01', '2024-03-01')
+    store.get_close_many(['INFY.NS', 'TCS.NS'], '2024-01-01', '2024-03-01')
+
+    assert source.calls == [(('INFY.NS', 'TCS.NS'), '2024-01-01', '2024-03-01')] * 2
+    assert frame.notna().all().all()
+    assert len(frame) == len(pd.bdate_range('2024-01-01', '2024-02-29'))
+
+
+def test_get_close_many_caches_empty_holiday_for_batch(root):
+    source = FakeBatchSource(['empty'])
+    store = PriceStore(root, source)
+    store.get_close_many(['INFY.NS', 'TCS.NS'], '2024-01-06', '2024-01-08')
+    store.get_close_many(['INFY.NS', 'TCS.NS'], '2024-01-06', '2024-01-08')
+
+    assert len(source.calls) == 1
@@ -0,0 +1,197 @@
+import os
+import random
+import re
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+import ledger
+from conftest import BACKEND, metadata
+
+USERS = 1000
+RECORDS_PER_USER = 100
+CATEGORIES = ['Food', 'Rent', 'Travel', 'Shopping', 'Bills', 'Health', 'Salary', 'Other']
+
+# Median latency allowed per query on the seeded data. A full scan of the
+# records table takes several times longer than this, so a lost index fails.
+LATENCY_BUDGET_MS = float(os.getenv('QUERY_LATENCY_BUDGET_MS', 2.0))
+
+
+@pytest.fixture(scope='module')
+def seeded(module_engine):
+    rng = random.Random(7)
+    start = date(2023, 1, 1)
+    rows = []
+    for serial_id in range(1, USERS + 1):
+        for _ in range(RECORDS_PER_USER):
+            rows.append((
+                serial_id,
+                (start + timedelta(days=rng.randrange(730))).isoformat(),
+                rng.choice(['Income', 'Expense']),
+                rng.choice(CATEGORIES),
+                round(rng.uniform(1, 5000), 2),
+            ))
+    rng.shuffle(rows)
+
+    with module_engine.begin() as connection:
+        raw = connection.connection.driver_connection
+        raw.executemany(
+            "INSERT INTO records (serial_id, transaction_date, transaction_type, category, amount) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        raw.executemany(
+            "INSERT INTO budgets (serial_id, category, budget_limit, spent, remaining) VALUES (?, ?, 10000, 0, 10000)",
+            [(serial_id, category) for serial_id in range(1, USERS + 1) for category in CATEGORIES],
+        )
+        raw.executemany(
+            "INSERT INTO reminder (serial_id, date, description, mobile_number) VALUES (?, ?, 'Pay bill', '0000000000')",
+            [(serial_id, datetime(2024, 1, day).isoformat(' ')) for serial_id in range(1, USERS + 1) for day in range(1, 11)],
+        )
+        raw.executemany(
+            "INSERT INTO vacation (serial_id, place, air_cost, days, budget_range, time_range) VALUES (?, 'Goa', 5000, 4, 'Medium', 'Winter')",
+            [(serial_id,) for serial_id in range(1, USERS + 1) for _ in range(3)],
+        )
+        for serial_id in range(1, USERS + 1, 10):
+            connection.execute(ledger._BACKFILL_CATEGORY_TOTALS_SQL, {'serial_id': serial_id})
+        connection.exec_driver_sql('ANALYZE')
+    return module_engine
+
+
+def query_plan(engine, sql, params):
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+def median_ms(engine, sql, params, repeat=50):
+    timings = []
+    with engine.connect() as connection:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            connection.execute(text(sql), params).all()
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+# (name, sql, params, index the plan must use)
+ACCESS_PATHS = [
+    (
+        'category_backfill',
+        ledger._BACKFILL_CATEGORY_TOTALS_SQL.text.split('ON CONFLICT')[0].split('INSERT INTO category_totals (serial_id, transaction_type, category, total)')[1],
+        {'serial_id': 42},
+        'ix_records_serial_type_category',
+    ),
+    (
+        'running_total_window',
+        """SELECT record_id, SUM(CASE WHEN transaction_type = 'Income' THEN amount ELSE -amount END)
+               OVER (ORDER BY record_id ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)
+           FROM records WHERE serial_id = :serial_id""",
+        {'serial_id': 42},
+        'ix_records_serial_record',
+    ),
+    (
+        'transaction_keyset_page',
+        """SELECT record_id, transaction_date, transaction_type, category, amount, total
+           FROM records WHERE serial_id = :serial_id AND record_id > :cursor
+           ORDER BY record_id LIMIT 50""",
+        {'serial_id': 42, 'cursor': 0},
+        'ix_records_serial_record',
+    ),
+    (
+        'transaction_date_range',
+        """SELECT record_id, amount FROM records
+           WHERE serial_id = :serial_id AND transaction_date >= :start AND transaction_date <= :end""",
+        {'serial_id': 42, 'start': '2024-01-01', 'end': '2024-01-31'},
+        'ix_records_serial_date',
+    ),
+    (
+        'category_spent_sum',
+        """SELECT SUM(amount) FROM records
+           WHERE serial_id = :serial_id AND transaction_type = 'Expense' AND category = :category""",
+        {'serial_id': 42, 'category': 'Food'},
+        'ix_records_serial_type_category',
+    ),
+    (
+        'category_analysis',
+        """SELECT category, total FROM category_totals
+           WHERE serial_id = :serial_id AND transaction_type = :transaction_type AND total <> 0
+           ORDER BY category""",
+        {'serial_id': 41, 'transaction_type': 'Expense'},
+        'sqlite_autoindex_category_totals_1',
+    ),
+    (
+        'budget_lookup',
+        "SELECT budget_limit, spent, remaining FROM budgets WHERE serial_id = :serial_id AND category = :category",
+        {'serial_id': 42, 'category': 'Food'},
+        'ux_budgets_serial_category',
+    ),
+    (
+        'budget_list',
+        "SELECT * FROM budgets WHERE serial_id = :serial_id",
+        {'serial_id': 42},
+        'ux_budgets_serial_category',
+    ),
+    (
+        'reminder_list',
+        "SELECT * FROM reminder WHERE serial_id = :serial_id",
+        {'serial_id': 42},
+        'ix_reminder_serial_date',
+    ),
+    (
+        'vacation_list',
+        "SELECT * FROM vacation WHERE serial_id = :serial_id",
+        {'serial_id': 42},
+        'ix_vacation_serial',
+    ),
+]
+
+
+def declared_indexes():
+    """{table: {index name: columns}} parsed from the model declarations in app.py."""
+    with open(os.path.join(BACKEND, 'app.py')) as handle:
+        source = handle.read()
+    tables = {}
+    for chunk in source.split("__tablename__ = '")[1:]:
+        table, body = chunk.split("'", 1)
+        body = body.split('\nclass ', 1)[0]
+        tables[table] = {name: tuple(re.findall(r"'(\w+)'", columns))
+                         for name, columns in re.findall(r"db\.Index\('(\w+)',\s*((?:'\w+',?\s*)+)", body)}
+    return tables
+
+
+def test_mirrored_indexes_match_app_models():
+    declared = declared_indexes()
+    for table in metadata.sorted_tables:
+        mirrored = {index.name: tuple(column.name for column in index.columns) for index in table.indexes}
+        assert mirrored == declared.get(table.name, {}), f"indexes on {table.name} differ from app.py"
+
+
+@pytest.mark.parametrize('name, sql, params, index', ACCESS_PATHS, ids=[path[0] for path in ACCESS_PATHS])
+def test_access_path_uses_index(seeded, name, sql, params, index):
+    plan = query_plan(seeded, sql, params)
+    assert index in plan, plan
+    assert not re.search(r'\bSCAN (records|budgets|reminder|vacation)\b(?! USING)', plan), plan
+
+
+@pytest.mark.parametrize('name, sql, params, index', ACCESS_PATHS, ids=[path[0] for path in ACCESS_PATHS])
+def test_access_path_latency(seeded, name, sql, params, index):
+    assert median_ms(seeded, sql, params) < LATENCY_BUDGET_MS
+
+
+def test_full_scan_would_break_budget(seeded):
+    # Guards the budget itself: the same lookup without its index must be slower than allowed
+    sql = "SELECT SUM(amount) FROM records NOT INDEXED WHERE serial_id = :serial_id AND category = :category"
+    assert median_ms(seeded, sql, {'serial_id': 42, 'category': 'Food'}, repeat=5) > LATENCY_BUDGET_MS
+
+
+def test_budget_upsert_resolves_against_unique_index(seeded):
+    # ON CONFLICT (serial_id, category) is rejected by the database unless the unique index exists
+    with seeded.begin() as connection:
+        row = connection.execute(ledger._UPSERT_BUDGET_SQL,
+                                 {'serial_id': 41, 'category': 'Food', 'budget_limit': 20000}).first()
+        count = connection.execute(text("SELECT COUNT(*) FROM budgets WHERE serial_id = 41 AND category = 'Food'")).scalar()
+    assert float(row[0]) == 20000
+    assert count == 1
@@ -0,0 +1,173 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import ticker_info
+from ticker_info import TickerInfoCache, TickerInfoUnavailable
+
+
+class FakeFetcher:
+    """Returns {'symbol', 'version'} per call, or raises while failing is set."""
+
+    def __init__(self):
+        self.calls = []
+        self.failing = False
+        self.gate = None
+
+    def __call__(self, symbol):
+        self.calls.append(symbol)
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.failing:
+            raise ValueError(f"No metadata returned for {symbol}")
+        return {'symbol': symbol, 'version': len(self.calls)}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ticker_info, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def settle(cache):
+    deadline = time.monotonic() + 5
+    while cache.metrics()['in_flight']:
+        assert time.monotonic() < deadline, "background refresh never finished"
+        time.sleep(0.01)
+
+
+def make_cache(fetcher):
+    return TickerInfoCache(fetcher, ttl=60, max_stale=600, retry_after=30, negative_ttl=10)
+
+
+def test_fresh_entries_are_served_from_cache(clock):
+    fetcher = FakeFetcher()
+    cache = make_cache(fetcher)
+
+    assert cache.get('TCS.NS') == {'symbol': 'TCS.NS', 'version': 1}
+    clock[0] += 59
+    assert cache.get('TCS.NS')['version'] == 1
+    assert fetcher.calls == ['TCS.NS']
+    assert cache.metrics()['hits'] == 1
+
+
+def test_stale_entry_is_served_while_refreshing(clock):
+    fetcher = FakeFetcher()
+    cache = make_cache(fetcher)
+    cache.get('TCS.NS')
+
+    clock[0] += 61
+    fetcher.gate = threading.Event()
+    assert cache.get('TCS.NS')['version'] == 1
+    # A second stale request joins the refresh already running
+    assert cache.get('TCS.NS')['version'] == 1
+    fetcher.gate.set()
+    settle(cache)
+
+    assert cache.get('TCS.NS')['version'] == 2
+    assert len(fetcher.calls) == 2
+    metrics = cache.metrics()
+    assert metrics['stale_hits'] == 2 and metrics['refreshes'] == 1
+
+
+def test_entry_past_max_stale_is_fetched_inline(clock):
+    fetcher = FakeFetcher()
+    cache = make_cache(fetcher)
+    cache.get('TCS.NS')
+
+    clock[0] += 601
+    assert cache.get('TCS.NS')['version'] == 2
+    assert cache.metrics()['misses'] == 2
+
+
+def test_failed_refresh_backs_off(clock):
+    fetcher = FakeFetcher()
+    cache = make_cache(fetcher)
+    cache.get('TCS.NS')
+
+    clock[0] += 61
+    fetcher.failing = True
+    assert cache.get('TCS.NS')['version'] == 1
+    settle(cache)
+    assert len(fetcher.calls) == 2
+
+    # Every request during the backoff gets the old value without going upstream
+    for _ in range(5):
+        clock[0] += 5
+        assert cache.get('TCS.NS')['version'] == 1
+    settle(cache)
+    assert len(fetcher.calls) == 2
+
+    clock[0] += 6
+    fetcher.failing = False
+    assert cache.get('TCS.NS')['version'] == 1
+    settle(cache)
+    assert cache.get('TCS.NS')['version'] == 3
+    assert cache.metrics()['errors'] == 1
+
+
+def test_failed_fetch_past_max_stale_keeps_old_value(clock):
+    fetcher = FakeFetcher()
+    cache = make_cache(fetcher)
+    cache.get('TCS.NS')
+
+    clock[0] += 601
+    fetcher.failing = True
+    assert cache.get('TCS.NS')['version'] == 1
+    assert cache.get('TCS.NS')['version'] == 1
+    assert len(fetcher.calls) == 2
+
+
+def test_unknown_symbol_is_negatively_cached(clock):
+    fetcher = FakeFetcher()
+    fetcher.failing = True
+    cache = make_cache(fetcher)
+
+    with pytest.raises(ValueError):
+        cache.get('NOPE.NS')
+    for _ in range(3):
+        with pytest.raises(TickerInfoUnavailable):
+            cache.get('NOPE.NS')
+    assert fetcher.calls == ['NOPE.NS']
+    assert cache.metrics()['negative_hits'] == 3
+
+    clock[0] += 10
+    with pytest.raises(ValueError):
+        cache.get('NOPE.NS')
+    assert len(fetcher.calls) == 2
+
+
+def test_invalidate_forgets_failures(clock):
+    fetcher = FakeFetcher()
+    fetcher.failing = True
+    cache = make_cache(fetcher)
+    with pytest.raises(ValueError):
+        cache.get('NOPE.NS')
+
+    fetcher.failing = False
+    cache.invalidate('NOPE.NS')
+    assert cache.get('NOPE.NS')['version'] == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+    fetcher = FakeFetcher()
+    fetcher.gate = threading.Event()
+    cache = make_cache(fetcher)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get('TCS.NS'))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.metrics()['coalesced'] < 3:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    fetcher.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert fetcher.calls == ['TCS.NS']
+    assert results == [{'symbol': 'TCS.NS', 'version': 1}] * 4
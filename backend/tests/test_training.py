@@ -0,0 +1,117 @@
+import time
+
+import numpy as np
+import pytest
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+from stock import GRUModel, StockPredictor
+from training import train_gru
+
+TIME_STEP = 20
+
+
+def make_windows(rows, seed=0):
+    """Scaled random-walk closes cut into (X, y) training windows."""
+    rng = np.random.default_rng(seed)
+    closes = np.cumsum(rng.normal(0, 1, rows))
+    scaled = ((closes - closes.min()) / (closes.max() - closes.min())).reshape(-1, 1)
+    X, y = StockPredictor.create_dataset(None, scaled, time_step=TIME_STEP)
+    return X, y.reshape(-1, 1)
+
+
+def make_model(seed=0, hidden_size=8):
+    torch.manual_seed(seed)
+    return GRUModel(input_size=1, hidden_size=hidden_size, output_size=1)
+
+
+def validation_loss(model, X, y, fraction=0.1):
+    n_val = int(len(X) * fraction)
+    model.eval()
+    with torch.no_grad():
+        return nn.MSELoss()(model(X[len(X) - n_val:]), y[len(y) - n_val:]).item()
+
+
+def test_loss_decreases_and_best_weights_are_kept():
+    X, y = make_windows(320)
+    model = make_model()
+    summary = train_gru(model, X, y, epochs=12, batch_size=32, learning_rate=0.01, patience=12, seed=0)
+
+    curves = summary['loss_curve']
+    assert summary['epochs_run'] == 12
+    assert len(curves['train']) == len(curves['validation']) == 12
+    assert curves['train'][-1] < curves['train'][0]
+    assert min(curves['validation']) < curves['validation'][0]
+    assert curves['validation'][summary['best_epoch'] - 1] == min(curves['validation'])
+    assert validation_loss(model, X, y) == pytest.approx(min(curves['validation']), abs=1e-6)
+
+    with torch.no_grad():
+        assert model(X[:5]).shape == (5, 1)
+
+
+def test_training_is_deterministic_with_a_seed():
+    X, y = make_windows(200)
+    first = train_gru(make_model(), X, y, epochs=3, seed=1)
+    second = train_gru(make_model(), X, y, epochs=3, seed=1)
+    assert first['loss_curve'] == second['loss_curve']
+
+
+def test_early_stopping_when_validation_stops_improving():
+    X, y = make_windows(200)
+    # With a zero learning rate the validation loss never improves after the first epoch
+    summary = train_gru(make_model(), X, y, epochs=30, learning_rate=0.0, patience=3, seed=0)
+    assert summary['stopped'] == 'early_stopping'
+    assert summary['best_epoch'] == 1
+    assert summary['epochs_run'] == 4
+
+
+def test_time_budget_stops_training():
+    X, y = make_windows(200)
+    summary = train_gru(make_model(), X, y, epochs=30, time_budget=0, seed=0)
+    assert summary['stopped'] == 'time_budget'
+    assert summary['epochs_run'] == 1
+
+
+def test_short_series_trains_without_validation():
+    X, y = make_windows(60)
+    assert len(X) < 50
+    summary = train_gru(make_model(), X, y, epochs=4, seed=0)
+    assert summary['stopped'] == 'max_epochs'
+    assert summary['loss_curve']['validation'] == []
+
+
+def full_batch_adam(model, X, y, epochs, learning_rate=0.001):
+    """The fixed full-batch loop train_gru replaced, kept as the reference."""
+    criterion = nn.MSELoss()
+    optimizer = optim.Adam(model.parameters(), lr=learning_rate)
+    model.train()
+    for _ in range(epochs):
+        optimizer.zero_grad()
+        loss = criterion(model(X), y)
+        loss.backward()
+        optimizer.step()
+
+
+def test_mini_batches_are_more_accurate_than_the_old_loop():
+    X, y = make_windows(700)
+    split = len(X) - len(X) // 5
+    X_train, y_train, X_test, y_test = X[:split], y[:split], X[split:], y[split:]
+
+    results = {}
+    for name, train in (
+        ('full_batch', lambda model: full_batch_adam(model, X_train, y_train, epochs=30)),
+        ('train_gru', lambda model: train_gru(model, X_train, y_train, epochs=30, patience=5, seed=0)),
+    ):
+        # StockPredictor's hidden size and learning rate
+        model = make_model(hidden_size=50)
+        started = time.perf_counter()
+        train(model)
+        seconds = time.perf_counter() - started
+        model.eval()
+        with torch.no_grad():
+            rmse = torch.sqrt(nn.MSELoss()(model(X_test), y_test)).item()
+        results[name] = (rmse, seconds)
+
+    print(" ".join(f"{name}: RMSE {rmse:.4f} in {seconds:.2f}s" for name, (rmse, seconds) in results.items()))
+    assert results['train_gru'][0] < results['full_batch'][0] / 2
@@ -0,0 +1,58 @@
+import os
+import signal
+import time
+
+import pytest
+
+from training_jobs import TrainingJobQueue, TrainingPoolBroken
+
+# Offline the analysis falls back to synthetic prices, which is enough to exercise the pool
+JOB = ('TEST.NS', '2023-01-01', '2024-01-01')
+
+
+@pytest.fixture
+def jobs(tmp_path, monkeypatch):
+    # Spawned workers inherit the environment, so keep their caches out of the repo
+    monkeypatch.setenv('PRICE_CACHE_DIR', str(tmp_path / 'prices'))
+    monkeypatch.setenv('MODEL_REGISTRY_DIR', str(tmp_path / 'models'))
+    queue = TrainingJobQueue(workers=1, max_pending=4)
+    yield queue
+    if queue._pool is not None:
+        queue._pool.shutdown(wait=True, cancel_futures=True)
+        queue._manager.shutdown()
+
+
+def test_killed_worker_is_replaced(jobs):
+    first = jobs.run(*JOB, timeout=300, epochs=1)
+    assert first['status'] == 'success'
+
+    old_pool = jobs._pool
+    for pid in list(old_pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    deadline = time.monotonic() + 30
+    while not old_pool._broken:
+        assert time.monotonic() < deadline, "pool never noticed the dead worker"
+        time.sleep(0.05)
+
+    # The request that finds the pool broken is turned away...
+    with pytest.raises(TrainingPoolBroken):
+        jobs.run(*JOB, timeout=300, epochs=1)
+    # ...and the next one runs on fresh processes
+    second = jobs.run(*JOB, timeout=300, epochs=1)
+
+    assert second['status'] == 'success'
+    assert jobs._pool is not old_pool
+    metrics = jobs.metrics()
+    assert metrics['pool_restarts'] == 1
+    assert metrics['predictor_cache']['workers_reporting'] == 1
+
+
+def test_metrics_endpoint_reports_training_queue():
+    import stockflask
+
+    response = stockflask.app.test_client().get('/metrics')
+    assert response.status_code == 200
+    training = response.get_json()['training']
+    assert training['workers'] == stockflask.training_jobs.workers
+    assert training['pool_restarts'] == 0
+    assert training['predictor_cache'] == {'workers_reporting': 0}
@@ -0,0 +1,56 @@
+import os
+import time
+
+import pytest
+
+from conftest import FakeSource
+from price_store import PriceStore
+from training_jobs import TrainingJobQueue, available_cores
+
+CORES = len(available_cores())
+START, END = '2021-01-01', '2024-01-01'
+EPOCHS = 5
+
+
+def seed_prices(root, symbols):
+    """Store closes for each symbol so workers train on them without the network."""
+    store = PriceStore(root, FakeSource())
+    for symbol in symbols:
+        store.get_close(symbol, START, END)
+
+
+def throughput(workers, jobs, tmp_path):
+    """Analyses per second with this many pinned workers, after each worker has warmed up."""
+    symbols = [f"SCALE{workers}_{i}.NS" for i in range(workers + jobs)]
+    seed_prices(os.environ['PRICE_CACHE_DIR'], symbols)
+    queue = TrainingJobQueue(workers=workers, max_pending=workers + jobs, pin_cpus=True)
+    try:
+        def run_all(batch):
+            futures = [queue._jobs[queue.submit(symbol, START, END, epochs=EPOCHS)]['future'] for symbol in batch]
+            for future in futures:
+                assert future.result(timeout=600)['status'] == 'success'
+
+        # Loading torch in each process is not part of the steady state
+        run_all(symbols[:workers])
+        started = time.perf_counter()
+        run_all(symbols[workers:])
+        return jobs / (time.perf_counter() - started)
+    finally:
+        queue._pool.shutdown(wait=True)
+        queue._manager.shutdown()
+
+
+@pytest.mark.skipif(CORES < 2, reason="scaling needs at least two cores")
+def test_throughput_scales_with_one_worker_per_core(tmp_path, monkeypatch):
+    monkeypatch.setenv('PRICE_CACHE_DIR', str(tmp_path / 'prices'))
+    monkeypatch.setenv('MODEL_REGISTRY_DIR', str(tmp_path / 'models'))
+    monkeypatch.setenv('TRAINING_TIME_BUDGET', '600')
+    jobs = 2 * CORES
+
+    single = throughput(1, jobs, tmp_path)
+    per_core = throughput(CORES, jobs, tmp_path)
+    print(f"{jobs} analyses: 1 worker {single:.2f}/s, {CORES} pinned workers {per_core:.2f}/s "
+          f"({per_core / single:.1f}x)")
+
+    # Allow for shared caches and memory bandwidth, but parallel workers must pay off
+    assert per_core > single * min(CORES, 4) * 0.5
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import yfinance as yf
+
+
+def fetch_ticker_info(symbol):
+    info = yf.Ticker(symbol).info
+    if not info:
+        raise ValueError(f"No metadata returned for {symbol}")
+    return info
+
+
+class TickerInfoUnavailable(LookupError):
+    """The last fetch for this symbol failed recently and is not being retried yet."""
+
+
+class TickerInfoCache:
+    """Ticker metadata (sector, industry, market cap, P/E, ...) cached per symbol.
+
+    Entries younger than ttl are served directly. Older ones, up to
+    max_stale, are still served while a background thread refreshes them;
+    beyond that the caller waits for a fresh fetch. Concurrent requests for
+    the same symbol share one in-flight fetch.
+
+    A failed fetch is remembered: a symbol with a previous value keeps serving
+    it and is not refetched for retry_after seconds, and a symbol without one
+    (an invalid ticker, usually) raises TickerInfoUnavailable for
+    negative_ttl seconds instead of going upstream on every request.
+    """
+
+    def __init__(self, fetcher=fetch_ticker_info, ttl=6 * 3600, max_stale=7 * 24 * 3600,
+                 retry_after=300, negative_ttl=300):
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.retry_after = retry_after
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._failures = {}
+        self._inflight = {}
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0, 'refreshes': 0, 'errors': 0,
+                       'negative_hits': 0}
+
+    def _fetch(self, symbol, future):
+        try:
+            info = self.fetcher(symbol)
+        except Exception as e:
+            with self._lock:
+                self._stats['errors'] += 1
+                self._failures[symbol] = (e, time.monotonic())
+                self._inflight.pop(symbol, None)
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._entries[symbol] = (info, time.monotonic())
+            self._failures.pop(symbol, None)
+            self._inflight.pop(symbol, None)
+        future.set_result(info)
+
+    def _recent_failure(self, symbol, window):
+        """The error from symbol's last fetch if it failed less than window seconds ago. Call with the lock held."""
+        failure = self._failures.get(symbol)
+        if failure and time.monotonic() - failure[1] < window:
+            return failure[0]
+        return None
+
+    def _start_fetch(self, symbol):
+        """Return (future, started) for symbol's fetch, joining one already in flight. Call with the lock held."""
+        future = self._inflight.get(symbol)
+        if future is not None:
+            return future, False
+        future = Future()
+        self._inflight[symbol] = future
+        return future, True
+
+    def get(self, symbol):
+        with self._lock:
+            entry = self._entries.get(symbol)
+            age = time.monotonic() - entry[1] if entry else None
+            if entry and age < self.ttl:
+                self._stats['hits'] += 1
+                return entry[0]
+            if entry and self._recent_failure(symbol, self.retry_after) is not None:
+                # The last refresh failed; keep serving what we have until the backoff ends
+                self._stats['stale_hits'] += 1
+                return entry[0]
+            if entry and age < self.max_stale:
+                # Serve stale now, refresh once in the background
+                self._stats['stale_hits'] += 1
+                future, started = self._start_fetch(symbol)
+                if started:
+                    self._stats['refreshes'] += 1
+                    threading.Thread(target=self._fetch, args=(symbol, future), daemon=True).start()
+                return entry[0]
+            error = self._recent_failure(symbol, self.negative_ttl) if not entry else None
+            if error is not None:
+                self._stats['negative_hits'] += 1
+                raise TickerInfoUnavailable(f"No metadata for {symbol}, last fetch failed: {error}") from error
+            future, started = self._start_fetch(symbol)
+            self._stats['misses' if started else 'coalesced'] += 1
+
+        if started:
+            self._fetch(symbol, future)
+        try:
+            return future.result()
+        except Exception:
+            if entry:
+                return entry[0]
+            raise
+
+    def invalidate(self, symbol=None):
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                self._failures.clear()
+            else:
+                self._entries.pop(symbol, None)
+                self._failures.pop(symbol, None)
+
+    def metrics(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['stale_hits'] + self._stats['misses'] + self._stats['coalesced']
+            return {
+                'symbols': len(self._entries),
+                'in_flight': len(self._inflight),
+                **self._stats,
+                'hit_rate': round((self._stats['hits'] + self._stats['stale_hits']) / lookups, 4) if lookups else 0.0,
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_ticker_info_cache():
+    """Process-wide TickerInfoCache; TTLs come from TICKER_INFO_TTL, TICKER_INFO_MAX_STALE,
+    TICKER_INFO_RETRY_AFTER and TICKER_INFO_NEGATIVE_TTL (seconds)."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TickerInfoCache(
+                ttl=float(os.getenv('TICKER_INFO_TTL', 6 * 3600)),
+                max_stale=float(os.getenv('TICKER_INFO_MAX_STALE', 7 * 24 * 3600)),
+                retry_after=float(os.getenv('TICKER_INFO_RETRY_AFTER', 300)),
+                negative_ttl=float(os.getenv('TICKER_INFO_NEGATIVE_TTL', 300)),
+            )
+        return _default_cache
@@ -0,0 +1,72 @@
+import time
+
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+
+def train_gru(model, X, y, epochs=30, batch_size=32, learning_rate=0.001, patience=5,
+              validation_fraction=0.1, time_budget=None, progress=None, seed=None):
+    """Mini-batch Adam with early stopping and a wall-clock budget.
+
+    The last validation_fraction of the (chronological) training windows is
+    held out; training stops once validation loss has not improved for
+    patience epochs or time_budget seconds have passed, and the best weights
+    seen are restored. Returns a summary with per-epoch loss curves.
+    """
+    started = time.perf_counter()
+    n_val = int(len(X) * validation_fraction) if len(X) >= 50 else 0
+    X_fit, y_fit = X[:len(X) - n_val], y[:len(y) - n_val]
+    X_val, y_val = X[len(X) - n_val:], y[len(y) - n_val:]
+
+    criterion = nn.MSELoss()
+    optimizer = optim.Adam(model.parameters(), lr=learning_rate)
+    generator = torch.Generator().manual_seed(seed) if seed is not None else None
+
+    train_curve, val_curve = [], []
+    best_loss, best_epoch, best_state = float('inf'), 0, None
+    stopped = 'max_epochs'
+
+    for epoch in range(epochs):
+        model.train()
+        order = torch.randperm(len(X_fit), generator=generator)
+        total = 0.0
+        for i in range(0, len(order), batch_size):
+            batch = order[i:i + batch_size]
+            optimizer.zero_grad()
+            loss = criterion(model(X_fit[batch]), y_fit[batch])
+            loss.backward()
+            optimizer.step()
+            total += loss.item() * len(batch)
+        train_curve.append(round(total / len(X_fit), 6))
+
+        if n_val:
+            model.eval()
+            with torch.no_grad():
+                val_curve.append(round(criterion(model(X_val), y_val).item(), 6))
+        monitored = val_curve[-1] if n_val else train_curve[-1]
+
+        if progress:
+            progress(epoch + 1, epochs, monitored)
+        if (epoch + 1) % 10 == 0:
+            print(f'Epoch [{epoch+1}/{epochs}], Loss: {train_curve[-1]:.4f}')
+
+        if monitored < best_loss:
+            best_loss, best_epoch = monitored, epoch + 1
+            best_state = {k: v.detach().clone() for k, v in model.state_dict().items()}
+        elif n_val and epoch + 1 - best_epoch >= patience:
+            stopped = 'early_stopping'
+            break
+        if time_budget is not None and time.perf_counter() - started >= time_budget:
+            stopped = 'time_budget'
+            break
+
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    return {
+        'epochs_run': len(train_curve),
+        'best_epoch': best_epoch,
+        'stopped': stopped,
+        'seconds': round(time.perf_counter() - started, 3),
+        'loss_curve': {'train': train_curve, 'validation': val_curve},
+    }
@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+_predictor = None
+
+
+class TrainingQueueFull(Exception):
+    """Raised when the training queue already holds its maximum number of unfinished jobs."""
+
+
+class TrainingTimeout(Exception):
+    """Raised when a synchronous run() does not finish within its timeout; the job keeps running."""
+
+
+class TrainingPoolBroken(Exception):
+    """Raised when a worker process died and took the pool with it; the next submission gets a fresh pool."""
+
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def init_worker(threads, core_slots):
+    """Pool initializer: cap torch's thread pools and optionally pin this worker to its own cores."""
+    try:
+        cores = core_slots.get_nowait()
+    except queue.Empty:
+        cores = None
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+
+    import torch
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+
+def run_analysis(job_id, progress, worker_stats, stock_name, start, end, options):
+    """Worker-process entry point: runs StockPredictor.analyse and reports epochs into progress.
+
+    Afterwards the worker's model cache counters are published into
+    worker_stats under its pid, since the cache itself lives in this process.
+    """
+    global _predictor
+    if _predictor is None:
+        # Imported here so the parent process never has to load torch for the queue itself
+        from stock import StockPredictor
+        _predictor = StockPredictor()
+
+    def report(epoch, epochs, loss):
+        progress[job_id] = {'state': 'running', 'epoch': epoch, 'epochs': epochs, 'loss': round(loss, 6)}
+
+    progress[job_id] = {'state': 'running', 'epoch': 0, 'epochs': options.get('epochs', 30), 'loss': None}
+    try:
+        return _predictor.analyse(stock_name, start, end, progress=report, **options)
+    finally:
+        worker_stats[os.getpid()] = _predictor.predictors.metrics()
+
+
+class TrainingJobQueue:
+    """Runs stock analyses on a bounded process pool so training never blocks request threads.
+
+    Workers publish epoch and loss into a Manager dict that status() reads.
+    At most max_pending jobs may be queued or running; finished jobs are
+    kept for retention seconds so clients can collect the result.
+
+    The machine's cores are split evenly between workers: each one sets
+    torch to cores // workers threads, and with pin_cpus also binds itself
+    to its own slice, so parallel fits don't oversubscribe the CPU. The
+    default is one single-threaded worker per available core. Pinning is
+    off by default because under a CPU quota (rather than a cpuset) the
+    visible cores are not all ours to claim.
+    """
+
+    def __init__(self, workers=None, max_pending=16, retention=3600, pin_cpus=False):
+        workers = workers or len(available_cores())
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.pin_cpus = pin_cpus
+        cores = available_cores()
+        self.threads_per_worker = max(1, len(cores) // workers)
+        if pin_cpus and len(cores) >= workers:
+            self._core_slots = [cores[i * self.threads_per_worker:(i + 1) * self.threads_per_worker] for i in range(workers)]
+        else:
+            self._core_slots = []
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._pool = None
+        self._manager = None
+        self._progress = None
+        self._worker_stats = None
+        self._restarts = 0
+
+    def _start(self):
+        # Spawned lazily: the pool and manager processes only exist once a job is submitted
+        if self._pool is None:
+            context = multiprocessing.get_context('spawn')
+            self._manager = context.Manager()
+            self._progress = self._manager.dict()
+            self._worker_stats = self._manager.dict()
+            slots = context.Queue()
+            for cores in self._core_slots:
+                slots.put(cores)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                             initializer=init_worker, initargs=(self.threads_per_worker, slots))
+
+    def _discard_pool(self, pool):
+        """Drop a broken pool and its manager so _start builds new ones. Call with the lock held."""
+        if self._pool is not pool:
+            # Another request already replaced it
+            return
+        pool.shutdown(wait=False, cancel_futures=True)
+        try:
+            self._manager.shutdown()
+        except Exception:
+            pass
+        self._pool = self._manager = self._progress = self._worker_stats = None
+        self._restarts += 1
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id in [j for j, job in self._jobs.items() if job['future'].done() and job['finished_at'] and job['finished_at'] < cutoff]:
+            del self._jobs[job_id]
+            self._progress.pop(job_id, None)
+
+    def submit(self, stock_name, start, end, **options):
+        """Queue an analysis and return its job id; raises TrainingQueueFull when saturated."""
+        with self._lock:
+            self._start()
+            self._prune()
+            unfinished = sum(1 for job in self._jobs.values() if not job['future'].done())
+            if unfinished >= self.max_pending:
+                raise TrainingQueueFull("Training queue is full")
+
+            job_id = uuid.uuid4().hex
+            pool = self._pool
+            try:
+                self._progress[job_id] = {'state': 'queued', 'epoch': 0, 'epochs': options.get('epochs', 30), 'loss': None}
+                future = pool.submit(run_analysis, job_id, self._progress, self._worker_stats, stock_name, start, end, options)
+            except (BrokenProcessPool, EOFError, OSError) as e:
+                # A dead worker or manager; rebuild on the next submission rather than failing forever
+                self._discard_pool(pool)
+                raise TrainingPoolBroken("Training workers restarted, please retry") from e
+            job = {'future': future, 'pool': pool, 'stock_name': stock_name, 'submitted_at': time.time(), 'finished_at': None}
+            future.add_done_callback(lambda _: job.update(finished_at=time.time()))
+            self._jobs[job_id] = job
+            return job_id
+
+    def run(self, stock_name, start, end, timeout=None, **options):
+        """Submit and wait: the synchronous path shares the same worker budget as queued jobs."""
+        job_id = self.submit(stock_name, start, end, **options)
+        with self._lock:
+            job = self._jobs[job_id]
+        future = job['future']
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            raise TrainingTimeout(job_id)
+        except BrokenProcessPool as e:
+            with self._lock:
+                self._discard_pool(job['pool'])
+            raise TrainingPoolBroken("Training worker died, please retry") from e
+
+    def status(self, job_id):
+        """Progress and, once finished, the analysis result; None for unknown or expired jobs."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            progress = dict(self._progress.get(job_id, {})) if self._progress is not None else {}
+
+        future = job['future']
+        status = {
+            'job_id': job_id,
+            'stock_name': job['stock_name'],
+            'state': progress.pop('state', 'queued'),
+            'progress': progress,
+            'submitted_at': job['submitted_at'],
+        }
+        if future.done():
+            error = future.exception()
+            if error is not None:
+                status.update(state='failed', error=str(error))
+            else:
+                result = future.result()
+                status.update(state='failed' if result.get('status') == 'error' else 'done', result=result)
+        return status
+
+    def _predictor_cache_metrics(self):
+        """Model cache counters summed over the workers that have reported. Call with the lock held."""
+        try:
+            reports = list(self._worker_stats.values()) if self._worker_stats is not None else []
+        except (EOFError, OSError):
+            reports = []
+        totals = {'workers_reporting': len(reports)}
+        for report in reports:
+            for name, value in report.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def metrics(self):
+        with self._lock:
+            states = [job['future'].done() for job in self._jobs.values()]
+            return {
+                'workers': self.workers,
+                'threads_per_worker': self.threads_per_worker,
+                'pinned': bool(self._core_slots),
+                'max_pending': self.max_pending,
+                'unfinished': states.count(False),
+                'finished': states.count(True),
+                'pool_restarts': self._restarts,
+                'predictor_cache': self._predictor_cache_metrics(),
+            }
@@ -0,0 +1,57 @@
+import argparse
+import os
+from datetime import datetime
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+LISTING_URL = "https://www.etmoney.com/mutual-funds/all-funds-listing"
+FILTER_TOGGLE = '//html/body/div[1]/div[6]/div[3]/div[2]/div/div[1]/div[2]/div[2]/div[2]/div[2]/div[1]/div/i'
+FILTER_OPTION = '/html/body/div[1]/div[6]/div[3]/div[2]/div/div[1]/div[2]/div[2]/div[2]/div[2]/div[1]/div/button[1]'
+
+
+def fetch_listing(driver, out_dir, label, load_more=5, timeout=15):
+    """Open the fund listing, expand it and save the raw page HTML.
+
+    Waits on the page itself instead of fixed sleeps: each "load more" click
+    is followed by a wait until more scheme cards are present. Returns the
+    path of the saved file; parsing is left to parse.py.
+    """
+    wait = WebDriverWait(driver, timeout)
+    driver.get(LISTING_URL)
+    wait.until(EC.element_to_be_clickable((By.XPATH, FILTER_TOGGLE))).click()
+    wait.until(EC.element_to_be_clickable((By.XPATH, FILTER_OPTION))).click()
+    wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, "scheme-name")))
+
+    for _ in range(load_more):
+        count = len(driver.find_elements(By.CLASS_NAME, "scheme-name"))
+        try:
+            driver.find_element(By.ID, "load_more_nav").click()
+            wait.until(lambda d: len(d.find_elements(By.CLASS_NAME, "scheme-name")) > count)
+        except (TimeoutException, WebDriverException):
+            break
+
+    path = os.path.join(out_dir, f"{label}.html")
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(driver.page_source)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Save raw fund-listing HTML for offline parsing")
+    parser.add_argument("--out", default=os.path.join("snapshots", datetime.now().strftime("%Y%m%d-%H%M%S")))
+    parser.add_argument("--label", default="listing")
+    parser.add_argument("--load-more", type=int, default=5)
+    parser.add_argument("--chromedriver", default="chromedriver.exe")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    driver = webdriver.Chrome(service=Service(executable_path=args.chromedriver))
+    try:
+        print(fetch_listing(driver, args.out, args.label, load_more=args.load_more))
+    finally:
+        driver.quit()
@@ -0,0 +1,92 @@
+import argparse
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from lxml import html
+
+COLUMNS = ['Name', 'Category', 'AUM', 'Current value', 'Return per annum', 'Expense ratio', 'Age']
+
+_PERCENT = re.compile(r'[-+]?\d+(?:\.\d+)?%')
+_AGE = re.compile(r'(\d+\+?)\s*(yrs?)', re.IGNORECASE)
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _texts(node, name):
+    return [' '.join(el.text_content().split()) for el in node.xpath(f".//*[{_has_class(name)}]")]
+
+
+def _cards(tree):
+    """Yield (scheme_element, card_element) pairs.
+
+    A card is the outermost ancestor of a scheme name that contains no other
+    scheme name, so every field is read from the same fund's block and the
+    columns can never drift out of line the way parallel lists did.
+    """
+    schemes = tree.xpath(f"//*[{_has_class('scheme-name')}]")
+    per_element = {}
+    for scheme in schemes:
+        for ancestor in scheme.iterancestors():
+            per_element[ancestor] = per_element.get(ancestor, 0) + 1
+    for scheme in schemes:
+        card = scheme
+        for ancestor in scheme.iterancestors():
+            if per_element[ancestor] != 1:
+                break
+            card = ancestor
+        yield scheme, card
+
+
+def parse_card(scheme, card):
+    name = ' '.join(scheme.text_content().split())
+    tags = _texts(card, 'tag')
+    ratio = ' '.join(_texts(card, 'mfFund-double'))
+    age = _AGE.search(' '.join(_texts(card, 'mfFund-age')))
+    current = _texts(card, 'current-value')
+    values = _texts(card, 'item-value')
+    return {
+        'Name': name,
+        'Category': str(tags[:2]),
+        'AUM': next((v for v in values if 'Crs' in v), ''),
+        'Current value': current[0] if current else '',
+        'Return per annum': next((v for v in values if 'p.a.' in v), ''),
+        'Expense ratio': (_PERCENT.findall(ratio) or [''])[0],
+        'Age': f"{age.group(1)} {age.group(2)}" if age else '',
+    }
+
+
+def parse_listing(page_html):
+    """Extract one record per fund card from a saved listing page."""
+    tree = html.fromstring(page_html)
+    return [parse_card(scheme, card) for scheme, card in _cards(tree)]
+
+
+def parse_file(path):
+    with open(path, encoding='utf-8') as handle:
+        return parse_listing(handle.read())
+
+
+def parse_snapshot(paths, workers=None):
+    """Parse saved pages in parallel and return one de-duplicated DataFrame."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        records = [record for page in pool.map(parse_file, paths) for record in page]
+    df = pd.DataFrame(records, columns=COLUMNS)
+    return df.drop_duplicates(subset='Name', keep='first').reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Parse saved fund-listing HTML into a CSV")
+    parser.add_argument("snapshot", help="Directory of .html files saved by fetch.py, or a single file")
+    parser.add_argument("-o", "--output", default="Lumpsum.csv")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.snapshot, "*.html"))) if os.path.isdir(args.snapshot) else [args.snapshot]
+    df = parse_snapshot(paths, workers=args.workers)
+    df.to_csv(args.output, index=False)
+    print(f"{len(df)} funds from {len(paths)} pages -> {args.output}")
@@ -0,0 +1,52 @@
+import os
+import sys
+
+SELENIUM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SELENIUM_DIR)
+
+import parse  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'listing.html')
+
+
+def test_parse_listing_keeps_fields_with_their_card():
+    records = parse.parse_file(FIXTURE)
+
+    assert records == [
+        {
+            'Name': 'Quant Small Cap Fund',
+            'Category': str(['EQUITY', 'SMALL CAP']),
+            'AUM': '₹26645 Crs',
+            'Current value': '₹69322',
+            'Return per annum': '+47.29% p.a.',
+            'Expense ratio': '0.64%',
+            'Age': '11+ yrs',
+        },
+        {
+            'Name': 'Bank of India Small Cap Fund',
+            'Category': str(['EQUITY', 'SMALL CAP']),
+            'AUM': '₹1517 Crs',
+            'Current value': '₹49687',
+            'Return per annum': '+37.80% p.a.',
+            'Expense ratio': '',
+            'Age': '5+ yrs',
+        },
+        {
+            'Name': 'HDFC Liquid Fund',
+            'Category': str(['DEBT']),
+            'AUM': '₹61023 Crs',
+            'Current value': '₹12840',
+            'Return per annum': '+7.05% p.a.',
+            'Expense ratio': '0.20%',
+            'Age': '1 yr',
+        },
+    ]
+    assert all(list(record) == parse.COLUMNS for record in records)
+
+
+def test_parse_snapshot_builds_one_row_per_fund():
+    df = parse.parse_snapshot([FIXTURE, FIXTURE], workers=1)
+
+    assert list(df.columns) == parse.COLUMNS
+    assert list(df['Name']) == ['Quant Small Cap Fund', 'Bank of India Small Cap Fund', 'HDFC Liquid Fund']
+    assert list(df['Expense ratio']) == ['0.64%', '', '0.20%']